@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from telemetry import record
+
+# =====================================================
+# CONFIG
+# =====================================================
+
+CACHE_PATH = os.environ.get(
+    "AI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ai_cache.sqlite3")
+)
+CACHE_ENABLED = os.environ.get("AI_CACHE", "1") != "0"
+
+MAX_ENTRIES = 5000
+MAX_BYTES = 200 * 1024 * 1024
+MAX_AGE = 30 * 24 * 3600
+
+
+# =====================================================
+# KEY
+# =====================================================
+
+def make_key(model, prompt, options=None):
+    raw = json.dumps(
+        [model, prompt, options or {}],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# =====================================================
+# SQLITE RESPONSE CACHE (LRU + TTL)
+# =====================================================
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        path=CACHE_PATH,
+        max_entries=MAX_ENTRIES,
+        max_bytes=MAX_BYTES,
+        max_age=MAX_AGE
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                accessed REAL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)"
+        )
+        self._conn.commit()
+
+    def get(self, model, prompt, options=None):
+        key = make_key(model, prompt, options)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if now - row[1] > self.max_age:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+
+        return row[0]
+
+    def put(self, model, prompt, response, options=None):
+        key = make_key(model, prompt, options)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute(
+            "DELETE FROM responses WHERE created < ?",
+            (now - self.max_age,)
+        )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # drop least recently used rows until both limits hold
+        stale = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+
+# =====================================================
+# PROCESS-WIDE INSTANCE
+# =====================================================
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
+
+
+def cache_get(model, prompt, options=None, call_type="default"):
+    if not CACHE_ENABLED:
+        return None
+
+    start = time.perf_counter()
+    value = get_cache().get(model, prompt, options)
+
+    if value is not None:
+        record(call_type, model, time.perf_counter() - start, cache="hit")
+
+    return value
+
+
+def cache_put(model, prompt, response, options=None):
+    if not CACHE_ENABLED:
+        return
+    get_cache().put(model, prompt, response, options)
@@ -1,7 +1,26 @@
 import streamlit as st
-import requests
 import json
-import random
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import curriculum
+from balancer import as_credits, balance_roadmap
+from curriculum import AIJSONError
+from jobs import JobQueue
+from plan_store import PlanStore, new_plan_id
+from prereq_graph import validate_roadmap
+from roadmap_patch import apply_patch, compact_view
+from router import get_router
+from semantic_cache import get_semantic_index
+from shared_cache import get_shared_cache
+from ollama_client import OllamaClient, OllamaError
+from profiler import get_profiler
+from telemetry import get_registry
+from warmup import KEEP_ALIVE, ModelKeeper
+from timetable import generate_timetable
 
 # =====================================================
 # CONFIG
@@ -9,62 +28,309 @@ import random
 
 st.set_page_config(page_title="AI Academic Planning System", layout="wide")
 
+RUN_STARTED = time.perf_counter()
+
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+SESSION_WORKERS = 4
+ROADMAP_WORKERS = 4
 
-# =====================================================
-# AI JSON CALL
-# =====================================================
+# ROADMAP_MODE=parallel (default): outline first, then every semester as
+# its own concurrent call, retried per semester.
+# ROADMAP_MODE=stream: one roadmap prompt whose semesters are shown as
+# soon as each one is closed in the streamed reply.
+PARALLEL_ROADMAP = os.environ.get("ROADMAP_MODE", "parallel") != "stream"
 
-def call_ai(prompt, temperature=0.2):
-    try:
-        payload = {
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False,
-            "format": "json",
-            "options": {"temperature": temperature}
-        }
+MAX_CREDITS = 24
+JOB_WORKERS = 4
+JOB_POLL_SECONDS = 1.0
 
-        response = requests.post(OLLAMA_URL, json=payload)
 
-        if response.status_code != 200:
-            st.error("AI request failed")
-            st.code(response.text)
-            return None
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL, keep_alive=KEEP_ALIVE)
 
-        result = response.json()
-        text = result.get("response", "").strip()
 
-        if text.startswith("```"):
-            text = text.replace("```json", "").replace("```", "").strip()
+@st.cache_resource
+def get_keeper():
 
-        return json.loads(text)
+    # started once per server process; loads the models before anyone asks
+    return ModelKeeper(get_client(), get_router().models()).start()
 
-    except Exception:
-        st.error("Invalid JSON returned by AI")
-        if 'text' in locals():
-            st.code(text)
-        return None
+
+@st.cache_resource
+def get_jobs():
+    return JobQueue(JOB_WORKERS)
+
+
+@st.cache_resource
+def get_plans():
+    return PlanStore()
+
+
+get_keeper().touch()
 
 
 # =====================================================
-# SESSION STATE INIT
+# PLAN PERSISTENCE
 # =====================================================
 
-for key in [
-    "page",
+PLAN_FIELDS = [
     "user_data",
     "capability",
     "roadmap",
+    "roadmap_outline",
+    "roadmap_failed",
     "approved",
+    "session_store",
     "current_semester"
-]:
-    if key not in st.session_state:
+]
+
+
+def persist(*keys):
+
+    # the plan id lives in the URL, so a refresh finds the plan again
+    if st.session_state.plan_id is None:
+        st.session_state.plan_id = new_plan_id()
+        st.experimental_set_query_params(plan=st.session_state.plan_id)
+
+    get_plans().save(
+        st.session_state.plan_id,
+        {key: st.session_state[key] for key in keys}
+    )
+
+
+def restore_plan():
+
+    plan_id = st.experimental_get_query_params().get("plan", [None])[0]
+    plan = get_plans().load(plan_id) if plan_id else None
+
+    if plan:
+        for key in PLAN_FIELDS:
+            if key in plan:
+                st.session_state[key] = plan[key]
+        st.session_state.plan_id = plan_id
+
+        # point the open semester back at the roadmap's own entry
+        sem = st.session_state.current_semester
+        roadmap = st.session_state.roadmap
+        if sem and roadmap:
+            st.session_state.current_semester = next(
+                (s for s in roadmap.get("semesters", []) if s.get("semester_number") == sem.get("semester_number")),
+                None
+            )
+
+
+def start_new_plan():
+    for key in PLAN_FIELDS + ["plan_id"]:
         st.session_state[key] = None
+    st.session_state.session_store = {}
+    st.experimental_set_query_params()
+
+
+# =====================================================
+# AI JSON CALL
+# =====================================================
+
+def fetch_ai(prompt, temperature=None, call_type="default"):
+
+    # raises instead of writing to the page, so it is safe in worker threads
+    return curriculum.fetch_ai(get_client(), prompt, temperature, call_type)
+
+
+def reported(call_type, fn, *args):
+
+    # runs one generation step on the page, turning failures into messages
+    try:
+        with get_profiler().block(f"llm:{call_type}"):
+            return fn(*args)
+
+    except OllamaError as e:
+        st.error(f"AI request failed: {e}")
+        return None
+
+    except AIJSONError as e:
+        st.error("Invalid JSON returned by AI")
+        st.code(e.text)
+        return None
+
+
+def call_ai(prompt, temperature=None, call_type="default"):
+    return reported(call_type, fetch_ai, prompt, temperature, call_type)
+
+
+# =====================================================
+# BACKGROUND GENERATION JOBS
+# =====================================================
+
+def roadmap_task(job, client, data, outline=None, numbers=None, semesters=()):
+
+    # another session may already have generated the same (or a nearly
+    # identical) program
+    if outline is None:
+        hit = curriculum.cached_roadmap(data)
+        if hit:
+            job.progress.extend(hit["semesters"])
+            return {"outline": hit.get("outline"), "semesters": hit["semesters"], "failed": []}
+
+    expected = curriculum.semester_count(data)
+
+    if outline is None and not semesters and not PARALLEL_ROADMAP:
+        for sem in curriculum.stream_roadmap(client, data):
+            job.progress.append(sem)
+        merged = list(job.progress)
+
+        # semesters the stream never delivered are retried one by one
+        failed = list(range(len(merged) + 1, expected + 1))
+
+    else:
+        # a retry after a short streamed roadmap has no outline yet
+        if outline is None:
+            outline = curriculum.fetch_outline(client, data)
+        if numbers is None:
+            numbers = [s["semester_number"] for s in outline]
+
+        job.total = len(numbers)
+        done, failed = curriculum.fetch_semesters(
+            client,
+            data,
+            outline,
+            numbers,
+            ROADMAP_WORKERS,
+            on_semester=job.progress.append
+        )
+
+        merged = sorted(list(semesters) + done, key=lambda s: s["semester_number"])
+
+    # only complete roadmaps are shared
+    if len(merged) == expected and not failed:
+        curriculum.publish_roadmap(data, {"outline": outline, "semesters": merged})
+
+    return {"outline": outline, "semesters": merged, "failed": failed}
+
+
+def sessions_task(job, client, names):
+
+    # job.progress gets (name, sessions) as each course finishes, so the
+    # page can show it before the whole semester is done
+    job.total = len(names)
+    sessions = {}
+    errors = {}
+
+    for name, result, error in curriculum.fan_out(
+        lambda n: curriculum.fetch_sessions(client, n),
+        names,
+        SESSION_WORKERS
+    ):
+        if error:
+            errors[name] = str(error)
+        else:
+            sessions[name] = result.get("sessions", [])
+            job.progress.append((name, sessions[name]))
+
+    return {"sessions": sessions, "errors": errors}
+
+
+def submit_job(state_key, fn, *args, key=None):
+    st.session_state[state_key] = get_jobs().submit(
+        fn, get_client(), *args, key=key
+    )
+
+
+def current_job(state_key):
+
+    job = get_jobs().get(st.session_state[state_key])
+
+    # the id outlives the job after a server restart
+    if job is None:
+        st.session_state[state_key] = None
+
+    return job
+
+
+def collect_jobs():
+
+    # apply finished background work to this session, whatever page is open
+    messages = []
+
+    job = current_job("roadmap_job")
+    if job is not None and job.done:
+        st.session_state.roadmap_job = None
+        result = job.result
+
+        if job.status == "failed":
+            messages.append(f"Roadmap generation failed: {job.error}")
+        elif result["semesters"]:
+            st.session_state.roadmap = {"semesters": result["semesters"]}
+            st.session_state.roadmap_failed = result["failed"]
+            if result["outline"]:
+                st.session_state.roadmap_outline = result["outline"]
+            persist("roadmap", "roadmap_failed", "roadmap_outline")
+        else:
+            messages.append("Invalid JSON returned by AI")
+
+    job = current_job("sessions_job")
+    if job is not None and job.done:
+        st.session_state.sessions_job = None
+
+        if job.status == "failed":
+            messages.append(f"Session generation failed: {job.error}")
+        else:
+            st.session_state.session_store.update(job.result["sessions"])
+            persist("session_store")
+            for name, error in job.result["errors"].items():
+                messages.append(f"{name}: {error}")
+
+    return messages
+
+
+def wait_for(job, message):
+
+    # rerun until the job finishes so its results show up without a click
+    st.info(f"{message} ({job.elapsed():.0f}s)")
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
+
+
+# =====================================================
+# SESSION STATE INIT
+# =====================================================
+
+def init_session():
+
+    for key in [
+        "page",
+        "user_data",
+        "capability",
+        "roadmap",
+        "approved",
+        "current_semester",
+        "session_store",
+        "roadmap_outline",
+        "roadmap_failed",
+        "roadmap_job",
+        "sessions_job",
+        "plan_id",
+        "plan_checked"
+    ]:
+        if key not in st.session_state:
+            st.session_state[key] = None
+
+    # lazy load: the saved plan is read once per browser session
+    if not st.session_state.plan_checked:
+        st.session_state.plan_checked = True
+        restore_plan()
+
+    if st.session_state.session_store is None:
+        st.session_state.session_store = {}
+
+    if not st.session_state.page:
+        st.session_state.page = "User Input"
+
+    with get_profiler().block("collect_jobs"):
+        messages = collect_jobs()
 
-if not st.session_state.page:
-    st.session_state.page = "User Input"
+    for message in messages:
+        st.error(message)
 
 
 # =====================================================
@@ -99,28 +365,18 @@ def page_user_input():
             "weekly": weekly,
             "total_hours": total_hours
         }
+        persist("user_data")
 
-        prompt = f"""
-Respond ONLY in valid JSON.
-
-Predict achievable academic level.
-
-Degree: {degree}
-Domain: {domain}
-Focus: {focus}
-Current Level: {level}
-Total Study Hours: {total_hours}
-
-{{
- "predicted_level":"",
- "reason":""
-}}
-"""
-
-        result = call_ai(prompt)
+        result = reported(
+            "capability",
+            curriculum.fetch_capability,
+            get_client(),
+            st.session_state.user_data
+        )
 
         if result:
             st.session_state.capability = result
+            persist("capability")
             st.success("Capability Predicted")
             st.json(result)
 
@@ -133,67 +389,83 @@ Total Study Hours: {total_hours}
 # PAGE 2 — INTELLIGENT COURSE PLANNING
 # =====================================================
 
-def generate_roadmap():
+def render_semester(sem):
+    st.subheader(f"Semester {sem['semester_number']}")
+    st.write("Credits:", sem["total_credits"])
+    if as_credits(sem.get("total_credits")) > MAX_CREDITS:
+        st.error("Credit overload detected")
+    st.write("Summary:", sem["summary"])
+    for c in sem["courses"]:
+        st.write("•", c["name"])
 
-    data = st.session_state.user_data
-    semesters = data["duration"] * 2
 
-    prompt = f"""
-You are an academic architect.
+def page_course_planning():
 
-Respond ONLY with valid JSON.
+    st.title("📘 Intelligent Course Planning")
 
-Create structured semester roadmap.
+    job = current_job("roadmap_job")
 
-Degree: {data['degree']}
-Domain: {data['domain']}
-Focus: {data['focus']}
-Knowledge Level: {data['level']}
-Semesters: {semesters}
+    if not st.session_state.roadmap:
 
-Return:
-{{
- "semesters":[
-  {{
-   "semester_number":1,
-   "total_credits":20,
-   "summary":"",
-   "courses":[
-     {{
-       "name":"",
-       "difficulty":"Easy/Medium/Hard",
-       "credits":4,
-       "prerequisites":[]
-     }}
-   ]
-  }}
- ]
-}}
-"""
-    return call_ai(prompt)
+        if job is None and st.button("Generate AI Roadmap"):
+            data = st.session_state.user_data
+            submit_job(
+                "roadmap_job",
+                roadmap_task,
+                data,
+                key=curriculum.roadmap_key(data)
+            )
+            st.rerun()
 
+        if job is not None:
+            for sem in list(job.progress):
+                render_semester(sem)
 
-def page_course_planning():
+    if st.session_state.roadmap:
 
-    st.title("📘 Intelligent Course Planning")
+        roadmap = st.session_state.roadmap
+        failed = st.session_state.roadmap_failed
+
+        if failed:
+            st.warning(
+                "Semesters " + ", ".join(str(n) for n in failed)
+                + " could not be generated."
+            )
+
+            if job is None and st.button("Retry Failed Semesters"):
+                data = st.session_state.user_data
+                submit_job(
+                    "roadmap_job",
+                    roadmap_task,
+                    data,
+                    st.session_state.roadmap_outline,
+                    failed,
+                    roadmap["semesters"],
+                    key="retry:" + json.dumps([data, failed], sort_keys=True)
+                )
+                st.rerun()
 
-    if not st.session_state.roadmap:
-        if st.button("Generate AI Roadmap"):
-            roadmap = generate_roadmap()
-            if roadmap:
-                st.session_state.roadmap = roadmap
-                st.success("Roadmap Generated")
+        with get_profiler().block("validate_prereqs"):
+            issues = validate_roadmap(roadmap)
 
-    if st.session_state.roadmap:
+        if issues:
+            with st.expander(f"⚠️ Prerequisite issues ({len(issues)})"):
+                for issue in issues:
+                    st.write("•", issue)
 
-        roadmap = st.session_state.roadmap
+        with get_profiler().block("render_semesters"):
+            for sem in roadmap["semesters"]:
+                render_semester(sem)
 
-        for sem in roadmap["semesters"]:
-            st.subheader(f"Semester {sem['semester_number']}")
-            st.write("Credits:", sem["total_credits"])
-            st.write("Summary:", sem["summary"])
-            for c in sem["courses"]:
-                st.write("•", c["name"])
+        if st.button("⚖️ Balance Credit Load"):
+            updated, moves = balance_roadmap(roadmap, MAX_CREDITS)
+
+            if moves:
+                st.session_state.roadmap = updated
+                persist("roadmap")
+                st.rerun()
+
+            st.info("Credit load is already balanced")
 
         st.divider()
         st.subheader("➕ Modify or Add Course (AI Chatbot)")
@@ -205,32 +477,57 @@ def page_course_planning():
             prompt = f"""
 Respond ONLY in JSON.
 
-Current Curriculum:
-{json.dumps(roadmap)}
+Current Curriculum (id name [credits, difficulty]):
+{compact_view(roadmap)}
 
 User Suggestion:
 {user_course}
 
 You must:
 - Check duplicates
-- Validate prerequisites
+- List prerequisites of new courses by exact course name
 - Adjust semester if needed
-- Maintain balanced workload
 
-Return updated roadmap in same structure.
+Return ONLY the changes as operations, referring to courses by id:
+{{
+ "operations":[
+  {{"op":"add","semester":1,"course":{{"name":"","difficulty":"Easy/Medium/Hard","credits":4,"prerequisites":[]}}}},
+  {{"op":"move","id":"1.0","semester":2}},
+  {{"op":"remove","id":"1.0"}}
+ ],
+ "reason":""
+}}
 """
 
-            updated = call_ai(prompt)
+            patch = call_ai(prompt, call_type="modify")
 
-            if updated:
-                st.session_state.roadmap = updated
-                st.success("Curriculum Updated")
+            if patch:
+                updated, errors = apply_patch(roadmap, patch.get("operations", []))
+
+                for error in errors:
+                    st.warning(f"Skipped: {error}")
+
+                if updated != roadmap:
+                    st.session_state.roadmap = updated
+                    persist("roadmap")
+                    st.success("Curriculum Updated")
+
+                    for issue in set(validate_roadmap(updated)) - set(issues):
+                        st.warning(f"New prerequisite issue: {issue}")
+                    if patch.get("reason"):
+                        st.write("AI Reasoning:", patch["reason"])
+                else:
+                    st.info("No changes applied")
 
         if st.button("Approve & Continue"):
             st.session_state.approved = True
+            persist("approved")
             st.session_state.page = "Dashboard"
             st.rerun()
 
+    if job is not None:
+        wait_for(job, f"Generating roadmap: {len(job.progress)} semesters ready")
+
 
 # =====================================================
 # PAGE 3 — DASHBOARD
@@ -246,18 +543,20 @@ def page_dashboard():
         st.warning("No roadmap found.")
         return
 
-    for sem in roadmap["semesters"]:
-        st.subheader(f"Semester {sem['semester_number']}")
-        st.write("Total Credits:", sem["total_credits"])
-        st.write("Main Focus:", sem["summary"])
-
-        if st.button(
-            f"Open Semester {sem['semester_number']}",
-            key=f"open_{sem['semester_number']}"
-        ):
-            st.session_state.current_semester = sem
-            st.session_state.page = "Semester View"
-            st.rerun()
+    with get_profiler().block("render_semesters"):
+        for sem in roadmap["semesters"]:
+            st.subheader(f"Semester {sem['semester_number']}")
+            st.write("Total Credits:", sem["total_credits"])
+            st.write("Main Focus:", sem["summary"])
+
+            if st.button(
+                f"Open Semester {sem['semester_number']}",
+                key=f"open_{sem['semester_number']}"
+            ):
+                st.session_state.current_semester = sem
+                persist("current_semester")
+                st.session_state.page = "Semester View"
+                st.rerun()
 
 
 # =====================================================
@@ -265,46 +564,7 @@ def page_dashboard():
 # =====================================================
 
 def generate_sessions(course_name):
-
-    prompt = f"""
-Respond ONLY in JSON.
-
-Break course into progressive sessions.
-
-Course: {course_name}
-
-{{
- "sessions":[
-  {{
-   "session_number":1,
-   "topic":"",
-   "description":""
-  }}
- ]
-}}
-"""
-    return call_ai(prompt)
-
-
-def generate_timetable(courses, weekly_hours):
-
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-    table = {d: [] for d in days}
-
-    if not courses:
-        return table
-
-    per_course = weekly_hours / len(courses)
-
-    for c in courses:
-        chosen = random.sample(days, 2)
-        for d in chosen:
-            table[d].append({
-                "course": c["name"],
-                "hours": round(per_course / 2, 1)
-            })
-
-    return table
+    return reported("sessions", curriculum.fetch_sessions, get_client(), course_name)
 
 
 def page_semester_view():
@@ -319,53 +579,219 @@ def page_semester_view():
 
     tab1, tab2 = st.tabs(["Subjects", "Timetable"])
 
+    job = current_job("sessions_job")
+
     with tab1:
+
+        store = st.session_state.session_store
+
+        # courses the running job has already finished are kept right away
+        if job is not None:
+            arrived = {name: sessions for name, sessions in list(job.progress) if name not in store}
+            if arrived:
+                store.update(arrived)
+                persist("session_store")
+
+        pending = [c["name"] for c in sem["courses"] if c["name"] not in store]
+
+        if job is not None:
+            total = job.total or 1
+            st.progress(
+                len(job.progress) / total,
+                text=f"{len(job.progress)}/{total} courses done"
+            )
+
+        elif pending and st.button(
+            f"Generate Sessions for Whole Semester ({len(pending)} courses)",
+            key=f"sess_all_{sem['semester_number']}"
+        ):
+            submit_job(
+                "sessions_job",
+                sessions_task,
+                pending,
+                key="sessions:" + json.dumps(sorted(pending))
+            )
+            st.rerun()
+
         for c in sem["courses"]:
             with st.expander(c["name"]):
 
-                if st.button(
+                if c["name"] in store:
+                    st.json(store[c["name"]])
+
+                elif st.button(
                     f"Generate Sessions for {c['name']}",
                     key=f"sess_{c['name']}"
                 ):
                     sessions = generate_sessions(c["name"])
                     if sessions:
-                        st.json(sessions)
+                        store[c["name"]] = sessions.get("sessions", [])
+                        persist("session_store")
+                        st.json(store[c["name"]])
 
     with tab2:
-        table = generate_timetable(
-            sem["courses"],
-            st.session_state.user_data["weekly"]
-        )
+        with get_profiler().block("timetable"):
+            table = generate_timetable(
+                sem["courses"],
+                st.session_state.user_data["weekly"]
+            )
         st.json(table)
 
+    if job is not None and not job.done:
+        wait_for(job, f"Generating sessions: {len(job.progress)}/{job.total or '?'} courses ready")
+
+
+# =====================================================
+# PAGE 5 — PERFORMANCE
+# =====================================================
+
+def latency_histogram(values, bins=20):
+    counts, edges = np.histogram(values, bins=min(bins, max(1, len(set(values)))))
+    labels = [f"{edges[i]:.0f}–{edges[i + 1]:.0f} ms" for i in range(len(counts))]
+    return pd.DataFrame({"calls": counts}, index=labels)
+
+
+def page_performance():
+
+    st.title("⚙️ Performance")
+
+    registry = get_registry()
+    summary = registry.snapshot()
+
+    calls = sum(s["calls"] for s in summary.values())
+    hits = sum(s["cache_hits"] for s in summary.values())
+    parse_errors = sum(s["parse_errors"] for s in summary.values())
+    reruns = [ms for _, _, ms in registry.reruns()]
+
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("In-flight requests", get_client().in_flight)
+    c2.metric("Running jobs", len(get_jobs().running()))
+    c3.metric("Cache hit rate", f"{hits / calls:.0%}" if calls else "–")
+    c4.metric(
+        "JSON parse failures",
+        f"{parse_errors / (calls - hits):.0%}" if calls > hits else "–"
+    )
+    c5.metric("Last rerun", f"{reruns[-1]:.0f} ms" if reruns else "–")
+
+    shared = get_shared_cache().stats()
+    semantic = get_semantic_index().stats()
+    st.caption(
+        f"Shared generation cache: {shared['entries']} entries, "
+        f"{shared['hits']} hits, {shared['misses']} misses · "
+        f"semantic index: {semantic['entries']} entries, {semantic['hits']} near matches"
+    )
+
+    if not summary:
+        st.info("No AI calls recorded in this process yet.")
+    else:
+        st.subheader("Per call type")
+        st.dataframe(pd.DataFrame(summary).T, use_container_width=True)
+
+        st.subheader("Latency histograms")
+        for call_type, values in sorted(registry.latencies().items()):
+            if values:
+                st.caption(call_type)
+                st.bar_chart(latency_histogram(values))
+
+    st.subheader("Model routing")
+    st.dataframe(pd.DataFrame(get_router().table()), use_container_width=True)
+
+    st.subheader("Resident models")
+    st.dataframe(pd.DataFrame(get_keeper().status()), use_container_width=True)
+
+    if reruns:
+        st.subheader("Script rerun duration (ms)")
+        st.line_chart(pd.DataFrame({"rerun_ms": reruns}))
+
+    if st.button("Reset Metrics"):
+        registry.reset()
+        st.rerun()
+
+    st.divider()
+    st.subheader("Rerun profiler")
+
+    profiler = get_profiler()
+    profiler.enabled = st.checkbox(
+        "Profile every rerun in this process",
+        value=profiler.enabled,
+        help="Times page blocks and collects a cProfile of each rerun; adds overhead."
+    )
+
+    rows = profiler.summary()
+    if rows:
+        st.caption(f"{profiler.profiled_runs()} reruns profiled")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+        data = profiler.export_bytes()
+        if data:
+            st.download_button(
+                "Download pstats",
+                data,
+                file_name="planner_reruns.pstats",
+                mime="application/octet-stream"
+            )
+
+        if st.button("Reset Profile"):
+            profiler.reset()
+            st.rerun()
+
 
 # =====================================================
 # NAVIGATION
 # =====================================================
 
-pages = [
-    "User Input",
-    "Course Planning",
-    "Dashboard",
-    "Semester View"
-]
+def navigate():
+
+    pages = [
+        "User Input",
+        "Course Planning",
+        "Dashboard",
+        "Semester View",
+        "Performance"
+    ]
+
+    page = st.sidebar.radio(
+        "Navigate",
+        pages,
+        index=pages.index(st.session_state.page)
+    )
+
+    if st.session_state.plan_id:
+        st.sidebar.caption(f"Plan ID: {st.session_state.plan_id}")
+
+        if st.sidebar.button("Start New Plan"):
+            start_new_plan()
+            st.session_state.page = "User Input"
+            st.rerun()
+
+    st.session_state.page = page
+    return page
+
+
+PROFILE_RUN = get_profiler().start_run()
+page = None
+
+try:
+    init_session()
+    page = navigate()
 
-page = st.sidebar.radio(
-    "Navigate",
-    pages,
-    index=pages.index(st.session_state.page)
-)
+    with get_profiler().block(page):
+        if page == "User Input":
+            page_user_input()
 
-st.session_state.page = page
+        elif page == "Course Planning":
+            page_course_planning()
 
-if page == "User Input":
-    page_user_input()
+        elif page == "Dashboard":
+            page_dashboard()
 
-elif page == "Course Planning":
-    page_course_planning()
+        elif page == "Semester View":
+            page_semester_view()
 
-elif page == "Dashboard":
-    page_dashboard()
+        elif page == "Performance":
+            page_performance()
 
-elif page == "Semester View":
-    page_semester_view()
+finally:
+    # st.rerun() raises through here too, so those runs are counted
+    get_profiler().finish_run(PROFILE_RUN)
+    get_registry().record_rerun(page, time.perf_counter() - RUN_STARTED)
@@ -0,0 +1,186 @@
+import copy
+
+from prereq_graph import course_key
+
+# =====================================================
+# CREDIT BALANCER
+# =====================================================
+#
+# Local search that moves (or swaps) courses between semesters to flatten
+# the credit load. A move from semester a to b lowers the sum of squared
+# loads exactly when load[a] - load[b] exceeds the credits moved, so every
+# accepted step strictly reduces the variance and the search terminates.
+# A step is only taken if the target stays within max_credits and every
+# prerequisite that is already satisfied stays in an earlier semester.
+
+MAX_ROUNDS = 10000
+
+
+def as_credits(value):
+
+    # model replies sometimes carry "4" instead of 4; anything else is 0
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, str):
+        try:
+            value = float(value) if "." in value else int(value)
+        except ValueError:
+            return 0
+    return value if isinstance(value, (int, float)) and value > 0 else 0
+
+
+class _Plan:
+
+    def __init__(self, credits, semester, prereqs, semester_count, max_credits):
+        self.credits = credits
+        self.semester = list(semester)
+        self.prereqs = prereqs
+        self.dependents = [[] for _ in credits]
+        self.max_credits = max_credits
+
+        for i, items in enumerate(prereqs):
+            for p in items:
+                self.dependents[p].append(i)
+
+        self.load = [0] * semester_count
+        self.buckets = [{} for _ in range(semester_count)]
+        for i in range(len(credits)):
+            self._place(i, semester[i])
+
+    def _place(self, i, s):
+        self.semester[i] = s
+        self.load[s] += self.credits[i]
+        self.buckets[s].setdefault(self.credits[i], set()).add(i)
+
+    def _take(self, i):
+        s = self.semester[i]
+        self.load[s] -= self.credits[i]
+        bucket = self.buckets[s][self.credits[i]]
+        bucket.discard(i)
+        if not bucket:
+            del self.buckets[s][self.credits[i]]
+
+    def allowed(self, i, s):
+        semester = self.semester
+        return (
+            all(semester[p] < s for p in self.prereqs[i])
+            and all(semester[d] > s for d in self.dependents[i])
+        )
+
+    def movable(self, a, c, b):
+        return next((i for i in sorted(self.buckets[a].get(c, ())) if self.allowed(i, b)), None)
+
+    def try_move(self, a, b):
+        gap = self.load[a] - self.load[b]
+        room = self.max_credits - self.load[b]
+
+        # credits closest to half the gap give the biggest improvement
+        for c in sorted(self.buckets[a], key=lambda c: abs(gap / 2 - c)):
+            if 0 < c < gap and c <= room:
+                i = self.movable(a, c, b)
+                if i is not None:
+                    self._take(i)
+                    self._place(i, b)
+                    return True
+        return False
+
+    def try_swap(self, a, b):
+        gap = self.load[a] - self.load[b]
+        room = self.max_credits - self.load[b]
+
+        pairs = [
+            (cx, cy)
+            for cx in self.buckets[a]
+            for cy in self.buckets[b]
+            if 0 < cx - cy < gap and cx - cy <= room
+        ]
+
+        for cx, cy in sorted(pairs, key=lambda p: abs(gap / 2 - (p[0] - p[1]))):
+            for x in sorted(self.buckets[a][cx]):
+                if not self.allowed(x, b):
+                    continue
+                y = self.movable(b, cy, a)
+                if y is not None:
+                    self._take(x)
+                    self._take(y)
+                    self._place(x, b)
+                    self._place(y, a)
+                    return True
+        return False
+
+    def improve(self):
+        order = sorted(range(len(self.load)), key=lambda s: self.load[s])
+
+        for a in reversed(order):
+            for b in order:
+                if self.load[a] - self.load[b] <= 0:
+                    break
+                if self.try_move(a, b) or self.try_swap(a, b):
+                    return True
+        return False
+
+
+def plan_balance(credits, semester, prereqs, semester_count, max_credits):
+
+    # credits[i], semester[i] (0-based index) and prereqs[i] (indexes of
+    # courses i depends on) describe the roadmap; returns new semesters
+    plan = _Plan(credits, semester, prereqs, semester_count, max_credits)
+
+    for _ in range(MAX_ROUNDS):
+        if not plan.improve():
+            break
+
+    return plan.semester
+
+
+def balance_roadmap(roadmap, max_credits, fields=("courses",)):
+
+    # courses live in sem[field] lists ("courses" in app.py, the three
+    # categories in planner4); a moved course keeps its field
+    updated = copy.deepcopy(roadmap)
+    semesters = sorted(updated.get("semesters", []), key=lambda s: s["semester_number"])
+
+    entries = []
+    for s, sem in enumerate(semesters):
+        for field in fields:
+            for c in sem.get(field, []) or []:
+                entries.append((s, field, c))
+
+    index = {course_key(c.get("name", "")): i for i, (_, _, c) in enumerate(entries)}
+
+    prereqs = []
+    for s, _, c in entries:
+        items = c.get("prerequisites") or []
+        linked = set()
+        for item in items if isinstance(items, list) else [items]:
+            name = item.get("name", "") if isinstance(item, dict) else item
+            p = index.get(course_key(name))
+            # only keep orderings the roadmap already satisfies
+            if p is not None and entries[p][0] < s:
+                linked.add(p)
+        prereqs.append(sorted(linked))
+
+    moved = plan_balance(
+        [as_credits(c.get("credits")) for _, _, c in entries],
+        [s for s, _, _ in entries],
+        prereqs,
+        len(semesters),
+        max_credits
+    )
+
+    moves = []
+    for (s, field, c), target in zip(entries, moved):
+        if target != s:
+            semesters[s][field] = [x for x in semesters[s][field] if x is not c]
+            semesters[target].setdefault(field, []).append(c)
+            moves.append((
+                c.get("name", ""),
+                semesters[s]["semester_number"],
+                semesters[target]["semester_number"]
+            ))
+
+    if moves and "courses" in fields:
+        for sem in semesters:
+            sem["total_credits"] = sum(as_credits(c.get("credits")) for c in sem.get("courses", []))
+
+    return updated, moves
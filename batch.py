@@ -0,0 +1,194 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import curriculum
+from curriculum import AIJSONError
+from prereq_graph import validate_roadmap
+from ollama_client import OLLAMA_URL, OllamaClient, OllamaError
+from timetable import generate_timetable
+
+# =====================================================
+# HEADLESS BATCH GENERATION
+# =====================================================
+#
+#   python batch.py programs.csv -o curricula.jsonl --workers 4
+#
+# Each CSV row needs degree, domain, focus, level, duration and weekly
+# columns (an optional id column is kept as-is). Every finished program is
+# appended to the JSONL output as one line; rerunning the same command
+# skips rows that already succeeded and retries the ones that failed.
+
+FIELDS = ["degree", "domain", "focus", "level", "duration", "weekly"]
+
+
+def program_id(row):
+    if row.get("id"):
+        return str(row["id"])
+    raw = json.dumps([str(row.get(f, "")).strip().lower() for f in FIELDS])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def whole_number(value):
+
+    # "4", "4.0" and " 4 " are 4; anything else is None
+    try:
+        number = float(str(value).strip())
+        whole = int(number)
+    except (ValueError, OverflowError):
+        return None
+    if number != whole or whole <= 0:
+        return None
+    return whole
+
+
+def read_programs(path):
+    programs = []
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            missing = [k for k in FIELDS if not str(row.get(k) or "").strip()]
+            if missing:
+                print(f"line {line}: missing {', '.join(missing)}, skipped")
+                continue
+
+            data = {k: row[k].strip() for k in FIELDS}
+
+            bad = [k for k in ("duration", "weekly") if whole_number(data[k]) is None]
+            if bad:
+                print(f"line {line}: {', '.join(bad)} must be a whole number, skipped")
+                continue
+
+            data["duration"] = whole_number(data["duration"])
+            data["weekly"] = whole_number(data["weekly"])
+            data["total_hours"] = data["duration"] * 52 * data["weekly"]
+
+            programs.append((program_id(row), data))
+
+    return programs
+
+
+def completed_ids(path):
+    done = set()
+
+    if not os.path.exists(path):
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "error" not in record:
+                done.add(record.get("id"))
+
+    return done
+
+
+def generate_program(client, data, semester_workers, with_sessions):
+
+    capability = curriculum.fetch_capability(client, data)
+    roadmap = curriculum.fetch_roadmap(client, data, semester_workers)
+
+    sessions = {}
+    timetables = {}
+
+    for sem in roadmap["semesters"]:
+
+        if with_sessions:
+            for c in sem["courses"]:
+                if c["name"] not in sessions:
+                    result = curriculum.fetch_sessions(client, c["name"])
+                    sessions[c["name"]] = result.get("sessions", [])
+
+        timetables[sem["semester_number"]] = generate_timetable(
+            sem["courses"],
+            data["weekly"]
+        )
+
+    return {
+        "capability": capability,
+        "roadmap": roadmap,
+        "issues": validate_roadmap(roadmap),
+        "sessions": sessions,
+        "timetables": timetables
+    }
+
+
+def run(args):
+
+    programs = read_programs(args.input)
+    done = completed_ids(args.output)
+    todo = [(pid, data) for pid, data in programs if pid not in done]
+
+    print(f"{len(programs)} programs, {len(programs) - len(todo)} already done")
+
+    if not todo:
+        return 0
+
+    client = OllamaClient(args.url, pool_size=args.workers * args.semester_workers)
+    failures = 0
+
+    def work(pid, data):
+        start = time.perf_counter()
+        record = {"id": pid, "input": data}
+
+        try:
+            record.update(
+                generate_program(client, data, args.semester_workers, not args.skip_sessions)
+            )
+        except (OllamaError, AIJSONError) as e:
+            record["error"] = str(e)
+        except Exception as e:
+            # malformed model output (a course without a name, a list
+            # where an object was expected) fails this program only
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        record["elapsed"] = round(time.perf_counter() - start, 2)
+        return record
+
+    with open(args.output, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=args.workers) as pool:
+
+        futures = [pool.submit(work, pid, data) for pid, data in todo]
+
+        for n, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+            status = f"failed: {record['error']}" if "error" in record else "ok"
+            print(f"[{n}/{len(todo)}] {record['id']} {status} ({record['elapsed']}s)")
+
+            if "error" in record:
+                failures += 1
+
+    client.close()
+    return 1 if failures else 0
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Generate curricula for many programs from a CSV file."
+    )
+    parser.add_argument("input", help="CSV with degree,domain,focus,level,duration,weekly")
+    parser.add_argument("-o", "--output", default="curricula.jsonl")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="programs generated concurrently")
+    parser.add_argument("--semester-workers", type=int, default=2,
+                        help="semester detail calls per program run concurrently")
+    parser.add_argument("--skip-sessions", action="store_true")
+    parser.add_argument("--url", default=OLLAMA_URL)
+
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ai_cache
+import curriculum
+import semantic_cache
+import shared_cache
+import telemetry
+from fake_ollama import FakeConfig, serve
+from ollama_client import OllamaClient
+from timetable import generate_timetable
+
+# =====================================================
+# END-TO-END LATENCY BENCHMARK
+# =====================================================
+#
+#   python benchmark.py                       # against a bundled fake server
+#   python benchmark.py --url http://localhost:11434/api/generate
+#
+# Runs each generation stage through the real call layer (OllamaClient,
+# curriculum.*) at several concurrency levels and prints p50 / p95 / p99
+# latency and throughput per stage. The response caches and the telemetry
+# log are switched off so every request reaches the server.
+
+STAGES = ["capability", "roadmap", "roadmap_stream", "sessions", "timetable", "chat"]
+
+
+def program(i):
+    return {
+        "degree": "B.Tech",
+        "domain": f"Domain {i}",
+        "focus": "Benchmarking",
+        "level": "Beginner",
+        "duration": 2,
+        "weekly": 20,
+        "total_hours": 2 * 52 * 20
+    }
+
+
+def run_stage(client, stage, i, semester_workers):
+
+    data = program(i)
+
+    if stage == "capability":
+        curriculum.fetch_capability(client, data)
+
+    elif stage == "roadmap":
+        curriculum.fetch_roadmap(client, data, semester_workers)
+
+    elif stage == "roadmap_stream":
+        for _ in curriculum.stream_roadmap(client, data):
+            pass
+
+    elif stage == "sessions":
+        curriculum.fetch_sessions(client, f"Course {i}")
+
+    elif stage == "timetable":
+        courses = [
+            {"name": f"Course {i}.{n}", "credits": 3 + n % 2, "difficulty": "Medium"}
+            for n in range(6 + i % 5)
+        ]
+        generate_timetable(courses, 20 + i % 7)
+
+    elif stage == "chat":
+        payload = {"model": curriculum.MODEL, "prompt": f"Explain topic {i} briefly."}
+        for _ in client.stream(payload, "chat"):
+            pass
+
+
+def percentile(values, q):
+
+    # nearest-rank percentile on a sorted copy
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(client, stage, concurrency, requests, semester_workers):
+
+    latencies = []
+    errors = 0
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            run_stage(client, stage, i, semester_workers)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency in pool.map(one, range(requests)):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    wall = time.perf_counter() - start
+
+    return {
+        "stage": stage,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0
+    }
+
+
+def run(args):
+
+    ai_cache.CACHE_ENABLED = False
+    shared_cache.SHARED_CACHE_ENABLED = False
+    semantic_cache.SEMANTIC_ENABLED = False
+    telemetry.TELEMETRY_ENABLED = False
+
+    server = None
+    url = args.url
+    if not url:
+        config = FakeConfig(args.latency, args.tps, args.jitter, seed=args.seed)
+        server, url = serve(port=0, config=config)
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    stages = args.stages.split(",") if args.stages else STAGES
+    client = OllamaClient(url, pool_size=max(levels) * max(1, args.semester_workers))
+    results = []
+
+    print(f"{'stage':<16}{'conc':>5}{'reqs':>6}{'err':>5}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+
+    for stage in stages:
+        for concurrency in levels:
+            r = measure(client, stage, concurrency, args.requests, args.semester_workers)
+            results.append(r)
+            print(f"{stage:<16}{concurrency:>5}{r['requests']:>6}{r['errors']:>5}"
+                  f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['throughput_rps']:>9}")
+
+    client.close()
+    if server:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "results": results}, f, indent=2)
+
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmark the generation stages.")
+    parser.add_argument("--url", help="real Ollama /api/generate URL (default: bundled fake)")
+    parser.add_argument("--stages", help="comma list from " + ",".join(STAGES))
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--requests", type=int, default=32,
+                        help="requests per stage and concurrency level")
+    parser.add_argument("--semester-workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="fake server time to first token")
+    parser.add_argument("--tps", type=float, default=0,
+                        help="fake server tokens per second (0 = instant)")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+
+    raise SystemExit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai_cache import cache_get, cache_put
+from json_stream import ArrayItemParser, repair_json
+from ollama_client import OllamaError
+from router import DEFAULT_MODEL, get_router, post_with_fallback, stream_with_fallback
+from schemas import response_format, validate
+from semantic_cache import cached_result, exact_key, find_result, publish_result
+from shared_cache import CAPABILITY_FIELDS, ROADMAP_FIELDS
+from telemetry import get_registry
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Generation steps shared by the Streamlit app and the batch CLI. Nothing
+# here touches st.*; callers pass in the OllamaClient and the user data.
+
+MODEL = DEFAULT_MODEL
+SEMESTER_RETRIES = 2
+CONTINUATION_ROUNDS = 2
+
+# list replies that can be continued after a truncation: call type ->
+# (array key, number field)
+CONTINUATIONS = {
+    "roadmap": ("semesters", "semester_number"),
+    "sessions": ("sessions", "session_number")
+}
+
+# replies whose complete prefix is still usable on its own
+REPAIRABLE = {"capability", "outline", "modify"}
+
+
+class AIJSONError(ValueError):
+
+    def __init__(self, text):
+        super().__init__("Invalid JSON returned by AI")
+        self.text = text
+
+
+# =====================================================
+# AI JSON CALL
+# =====================================================
+
+def routed(call_type, temperature=None, model=None):
+
+    # model and Ollama options for one call; explicit arguments win over
+    # the router
+    chosen, profile = get_router().route(call_type)
+    if temperature is not None:
+        profile["temperature"] = temperature
+    return model or chosen, profile
+
+
+def truncated(result):
+
+    # Ollama stops with done_reason "length" when num_predict runs out
+    return isinstance(result, dict) and result.get("done_reason") == "length"
+
+
+def limit_items(call_type, data, expected):
+
+    # (data with at most expected list items, whether none are missing);
+    # expected None means any count is complete
+    if expected is None or call_type not in CONTINUATIONS:
+        return data, True
+
+    key = CONTINUATIONS[call_type][0]
+    items = data.get(key) or []
+    return dict(data, **{key: items[:expected]}), len(items) >= expected
+
+
+def fetch_ai(client, prompt, temperature=None, call_type="default", model=None, expected=None):
+
+    # call types with a schema get constrained decoding and a checked,
+    # coerced result; expected is the list length a list reply must reach
+    # before it is cached
+    model, profile = routed(call_type, temperature, model)
+    options = dict(profile, format=response_format(call_type))
+    cached = cache_get(model, prompt, options, call_type=call_type)
+    result = None
+
+    if cached is not None:
+        text = cached
+    else:
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "format": options["format"],
+            "options": profile
+        }
+
+        # from here on model is the one that answered, which may be the
+        # route's fallback
+        response, model = post_with_fallback(client, payload, call_type)
+
+        if response.status_code != 200:
+            raise OllamaError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        result = response.json()
+        text = result.get("response", "").strip()
+
+    if text.startswith("```"):
+        text = text.replace("```json", "").replace("```", "").strip()
+
+    try:
+        data = validate(call_type, json.loads(text))
+    except ValueError:
+        # only a reply cut off by the output limit is worth salvaging
+        data = None
+        if truncated(result):
+            data = salvage(client, prompt, text, profile.get("temperature"), call_type, model, expected)
+        if data is None:
+            get_registry().parse_error(call_type)
+            raise AIJSONError(text)
+
+    data, complete = limit_items(call_type, data, expected)
+
+    if cached is None and complete:
+        cache_put(model, prompt, json.dumps(data, ensure_ascii=False), options)
+
+    return data
+
+
+def fetch_continuation(client, prompt, call_type, items, temperature=None, model=None, expected=None):
+
+    # asks only for the items missing after a cut-off reply; returns the
+    # whole list, renumbered and capped at expected, and whether it is
+    # complete (expected reached, or the model closed the list itself)
+    key, number = CONTINUATIONS[call_type]
+    model, profile = routed(call_type + "_continue", temperature, model)
+    items = list(items)
+    complete = False
+
+    for _ in range(CONTINUATION_ROUNDS):
+        payload = {
+            "model": model,
+            "prompt": continuation_prompt(prompt, key, len(items)),
+            "stream": False,
+            "format": response_format(call_type),
+            "options": profile
+        }
+
+        response, _ = post_with_fallback(client, payload, call_type + "_continue")
+
+        if response.status_code != 200:
+            raise OllamaError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        parser = ArrayItemParser(key)
+        more = parser.feed(response.json().get("response", ""))
+        items.extend(more)
+
+        if expected is not None:
+            complete = len(items) >= expected
+        else:
+            complete = parser.done
+
+        if complete or not more:
+            break
+
+    items = items[:expected]
+
+    for n, item in enumerate(items, 1):
+        if isinstance(item, dict):
+            item[number] = n
+
+    return items, complete
+
+
+def salvage(client, prompt, text, temperature=None, call_type="default", model=None, expected=None):
+
+    # a reply cut off by the output limit keeps its complete part: list
+    # replies drop the unfinished item and continue from there, the others
+    # are closed off where they stopped. None if nothing can be kept or a
+    # list is still short after the continuations, so a partial list is
+    # never returned (and cached) as if it were the whole answer
+    try:
+        if call_type in CONTINUATIONS:
+            key = CONTINUATIONS[call_type][0]
+            parser = ArrayItemParser(key)
+            items = parser.feed(text)
+
+            if not items:
+                return None
+
+            complete = parser.done if expected is None else len(items) >= expected
+            if not complete:
+                items, complete = fetch_continuation(
+                    client, prompt, call_type, items, temperature, model, expected
+                )
+            if not complete:
+                return None
+            data = validate(call_type, {key: items[:expected]})
+
+        elif call_type in REPAIRABLE:
+            data = validate(call_type, repair_json(text))
+
+        else:
+            return None
+
+    except (ValueError, OllamaError):
+        return None
+
+    get_registry().repaired(call_type)
+    return data
+
+
+def fan_out(fn, items, workers):
+
+    # runs fn over a bounded pool and yields (item, result, error) as each
+    # call finishes
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items)))) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except (OllamaError, AIJSONError) as e:
+                yield futures[future], None, e
+
+
+# =====================================================
+# PROMPTS
+# =====================================================
+
+def capability_prompt(data):
+
+    return f"""
+Respond ONLY in valid JSON.
+
+Predict achievable academic level.
+
+Degree: {data['degree']}
+Domain: {data['domain']}
+Focus: {data['focus']}
+Current Level: {data['level']}
+Total Study Hours: {data['total_hours']}
+
+{{
+ "predicted_level":"",
+ "reason":""
+}}
+"""
+
+
+def semester_count(data):
+    return int(data["duration"]) * 2
+
+
+def roadmap_prompt(data):
+
+    semesters = semester_count(data)
+
+    return f"""
+You are an academic architect.
+
+Respond ONLY with valid JSON.
+
+Create structured semester roadmap.
+
+Degree: {data['degree']}
+Domain: {data['domain']}
+Focus: {data['focus']}
+Knowledge Level: {data['level']}
+Semesters: {semesters}
+
+Return:
+{{
+ "semesters":[
+  {{
+   "semester_number":1,
+   "total_credits":20,
+   "summary":"",
+   "courses":[
+     {{
+       "name":"",
+       "difficulty":"Easy/Medium/Hard",
+       "credits":4,
+       "prerequisites":[]
+     }}
+   ]
+  }}
+ ]
+}}
+"""
+
+
+def outline_prompt(data):
+
+    semesters = semester_count(data)
+
+    return f"""
+You are an academic architect.
+
+Respond ONLY with valid JSON.
+
+Outline the semester progression. Give each semester a short theme only,
+no courses.
+
+Degree: {data['degree']}
+Domain: {data['domain']}
+Focus: {data['focus']}
+Knowledge Level: {data['level']}
+Semesters: {semesters}
+
+Return:
+{{
+ "semesters":[
+  {{
+   "semester_number":1,
+   "theme":""
+  }}
+ ]
+}}
+"""
+
+
+def semester_prompt(data, outline, number):
+
+    themes = "\n".join(
+        f"Semester {s['semester_number']}: {s['theme']}" for s in outline
+    )
+
+    return f"""
+You are an academic architect.
+
+Respond ONLY with valid JSON.
+
+Design the courses for ONE semester of this program.
+Do not repeat courses that belong to other semesters.
+
+Degree: {data['degree']}
+Domain: {data['domain']}
+Focus: {data['focus']}
+Knowledge Level: {data['level']}
+
+Program Outline:
+{themes}
+
+Semester: {number}
+Theme: {outline[number - 1]['theme']}
+
+Return:
+{{
+ "semester_number":{number},
+ "total_credits":20,
+ "summary":"",
+ "courses":[
+   {{
+     "name":"",
+     "difficulty":"Easy/Medium/Hard",
+     "credits":4,
+     "prerequisites":[]
+   }}
+ ]
+}}
+"""
+
+
+def continuation_prompt(prompt, key, done):
+
+    return f"""{prompt}
+
+Your previous answer was cut off after {key} number {done}.
+Continue from {key} number {done + 1}. Do not repeat earlier {key}.
+Return the same JSON format containing only the remaining {key}.
+"""
+
+
+def sessions_prompt(course_name):
+
+    return f"""
+Respond ONLY in JSON.
+
+Break course into progressive sessions.
+
+Course: {course_name}
+
+{{
+ "sessions":[
+  {{
+   "session_number":1,
+   "topic":"",
+   "description":""
+  }}
+ ]
+}}
+"""
+
+
+# =====================================================
+# GENERATION STEPS
+# =====================================================
+
+def roadmap_key(data):
+    return exact_key("roadmap", data, ROADMAP_FIELDS)
+
+
+def cached_roadmap(data):
+    return find_result("roadmap", data, ROADMAP_FIELDS)
+
+
+def publish_roadmap(data, roadmap):
+    publish_result("roadmap", data, roadmap, ROADMAP_FIELDS)
+
+
+def fetch_capability(client, data):
+    return cached_result(
+        "capability",
+        data,
+        lambda: fetch_ai(client, capability_prompt(data), call_type="capability"),
+        CAPABILITY_FIELDS
+    )
+
+
+def fetch_outline(client, data):
+    outline = fetch_ai(client, outline_prompt(data), call_type="outline")
+    return normalize_outline(outline, semester_count(data))
+
+
+def normalize_outline(outline, count):
+
+    # exactly one theme per semester, whatever the model returned
+    given = outline.get("semesters", []) if isinstance(outline, dict) else []
+    themes = []
+
+    for n in range(1, count + 1):
+        item = given[n - 1] if n <= len(given) and isinstance(given[n - 1], dict) else {}
+        themes.append({
+            "semester_number": n,
+            "theme": item.get("theme") or f"Semester {n} core studies"
+        })
+
+    return themes
+
+
+def fetch_semester(client, data, outline, number):
+
+    # a malformed semester is retried on its own, slightly warmer each time
+    for attempt in range(SEMESTER_RETRIES + 1):
+        try:
+            sem = fetch_ai(
+                client,
+                semester_prompt(data, outline, number),
+                temperature=0.2 + 0.2 * attempt,
+                call_type="semester"
+            )
+        except AIJSONError:
+            if attempt == SEMESTER_RETRIES:
+                raise
+            continue
+
+        if isinstance(sem, dict) and isinstance(sem.get("courses"), list):
+            sem["semester_number"] = number
+            if not sem["summary"]:
+                sem["summary"] = outline[number - 1]["theme"]
+            return sem
+
+    raise AIJSONError(json.dumps(sem))
+
+
+def fetch_semesters(client, data, outline, numbers, workers=1, on_semester=None):
+
+    # returns (semesters, failed numbers); one bad semester does not sink
+    # the others
+    semesters = []
+    failed = []
+
+    for number, sem, error in fan_out(
+        lambda n: fetch_semester(client, data, outline, n),
+        numbers,
+        workers
+    ):
+        if error:
+            failed.append(number)
+        else:
+            semesters.append(sem)
+            if on_semester:
+                on_semester(sem)
+
+    semesters.sort(key=lambda s: s["semester_number"])
+    return semesters, sorted(failed)
+
+
+def stream_roadmap(client, data, temperature=None, model=None):
+
+    # single-prompt roadmap; yields each semester as soon as the model
+    # closes its object, at most one per planned semester
+    prompt = roadmap_prompt(data)
+    expected = semester_count(data)
+    model, profile = routed("roadmap", temperature, model)
+    options = dict(profile, format=response_format("roadmap"))
+    cached = cache_get(model, prompt, options, call_type="roadmap")
+
+    if cached is not None:
+        yield from validate("roadmap", json.loads(cached))["semesters"][:expected]
+        return
+
+    parser = ArrayItemParser("semesters")
+    semesters = []
+    last = None
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "format": options["format"],
+        "options": profile
+    }
+
+    for model, chunk in stream_with_fallback(client, payload, "roadmap"):
+        last = chunk
+        for sem in parser.feed(chunk.get("response", "")):
+            if len(semesters) == expected:
+                continue
+            # a semester cannot be re-asked mid-stream, so one that fails
+            # its schema is counted and passed on as the model wrote it
+            try:
+                sem = validate("semester", sem)
+            except ValueError:
+                get_registry().parse_error("roadmap")
+            semesters.append(sem)
+            yield sem
+
+    if len(semesters) < expected:
+
+        # cut off by the output limit: keep what streamed and ask only for
+        # the rest. A reply that simply stopped short is not continued
+        if not semesters or not truncated(last):
+            get_registry().parse_error("roadmap")
+            return
+
+        try:
+            filled, complete = fetch_continuation(
+                client, prompt, "roadmap", semesters, profile.get("temperature"), model, expected
+            )
+        except OllamaError:
+            get_registry().parse_error("roadmap")
+            return
+
+        for sem in filled[len(semesters):]:
+            try:
+                yield validate("semester", sem)
+            except ValueError:
+                yield sem
+
+        # a roadmap that is still short is shown but never cached
+        if not complete:
+            get_registry().parse_error("roadmap")
+            return
+
+        get_registry().repaired("roadmap")
+        semesters = filled
+
+    try:
+        text = json.dumps(validate("roadmap", {"semesters": semesters}), ensure_ascii=False)
+    except ValueError:
+        return
+
+    cache_put(model, prompt, text, options)
+
+
+def fetch_roadmap(client, data, workers=1):
+
+    # outline first, then every semester concurrently; raises on the first
+    # semester that still fails after its own retries
+    def generate():
+        outline = fetch_outline(client, data)
+        numbers = [s["semester_number"] for s in outline]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(numbers)))) as pool:
+            semesters = list(pool.map(
+                lambda n: fetch_semester(client, data, outline, n),
+                numbers
+            ))
+
+        return {"outline": outline, "semesters": semesters}
+
+    result = cached_result("roadmap", data, generate, ROADMAP_FIELDS)
+    return {"semesters": result["semesters"]}
+
+
+def fetch_sessions(client, course_name):
+    return cached_result(
+        "sessions",
+        course_name,
+        lambda: fetch_ai(client, sessions_prompt(course_name), call_type="sessions")
+    )
@@ -0,0 +1,212 @@
+import re
+import zlib
+
+import numpy as np
+
+from balancer import as_credits
+from prereq_graph import course_key
+
+# =====================================================
+# NEAR-DUPLICATE COURSE DETECTION
+# =====================================================
+#
+# Course names are normalised (lowercase, common abbreviations expanded,
+# filler words dropped), turned into hashed character trigram vectors and
+# compared all-against-all with one matrix product per block of rows.
+# "Intro to Machine Learning" and "Introduction to ML" both normalise to
+# "introduction machine learning". Roman levels become digits, so
+# "Calculus II" and "Calculus 2" match. "Calculus I" and "Calculus II" are
+# kept apart because their level numbers differ, "Data Structures" and
+# "Data Structures Lab" because one carries a session-type tag.
+
+THRESHOLD = 0.85
+NGRAM = 3
+DIMS = 1024
+BLOCK = 1024
+
+ABBREVIATIONS = {
+    "intro": "introduction",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "db": "database",
+    "dbms": "database management systems",
+    "os": "operating systems",
+    "oop": "object oriented programming",
+    "dsa": "data structures algorithms",
+    "prog": "programming",
+    "fund": "fundamentals",
+    "adv": "advanced",
+    "mgmt": "management",
+    "stats": "statistics",
+    "math": "mathematics",
+    "maths": "mathematics",
+    "eng": "engineering",
+    "sys": "systems",
+    "dev": "development",
+    "laboratory": "lab",
+    "labs": "lab",
+    "practical": "lab",
+    "tut": "tutorial"
+}
+
+STOPWORDS = {"a", "an", "and", "the", "to", "of", "in", "for", "on", "with", "&"}
+
+LEVELS = re.compile(r"^\d+$")
+ROMAN = {r: str(i) for i, r in enumerate(["i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x"], 1)}
+
+TAGS = {"lab", "project", "seminar", "workshop", "tutorial", "practicum", "studio", "capstone", "thesis"}
+
+
+def normalize_name(name):
+    tokens = re.sub(r"[^a-z0-9&]+", " ", str(name).lower()).split()
+    words = []
+
+    for token in tokens:
+        if token in STOPWORDS:
+            continue
+        token = ROMAN.get(token, token)
+        words.extend(ABBREVIATIONS.get(token, token).split())
+
+    return " ".join(words)
+
+
+def qualifiers(text):
+
+    # level numbers and session-type tags of a normalised name; two names
+    # only count as duplicates when these are equal
+    return frozenset(t for t in text.split() if t in TAGS or LEVELS.match(t))
+
+
+def ngram_matrix(texts, n=NGRAM, dims=DIMS):
+
+    # rows are L2-normalised hashed trigram counts; crc32 keeps the
+    # hashing stable across processes
+    rows = []
+    cols = []
+
+    for i, text in enumerate(texts):
+        padded = f" {text} "
+        for k in range(max(1, len(padded) - n + 1)):
+            rows.append(i)
+            cols.append(zlib.crc32(padded[k:k + n].encode("utf-8")) % dims)
+
+    flat = np.array(rows, dtype=np.int64) * dims + np.array(cols, dtype=np.int64)
+    matrix = np.bincount(flat, minlength=len(texts) * dims)
+    matrix = matrix.reshape(len(texts), dims).astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def near_duplicates(names, threshold=THRESHOLD):
+
+    # returns (i, j, score) for every pair i < j above the threshold
+    texts = [normalize_name(n) for n in names]
+    if len(texts) < 2:
+        return []
+
+    # identical normalised names only need one row in the matrix
+    unique = list(dict.fromkeys(texts))
+    position = {t: k for k, t in enumerate(unique)}
+    members = [[] for _ in unique]
+    for i, t in enumerate(texts):
+        members[position[t]].append(i)
+
+    matrix = ngram_matrix(unique)
+    levels = [qualifiers(t) for t in unique]
+    pairs = []
+
+    for group in members:
+        pairs.extend((group[0], j, 1.0) for j in group[1:] if texts[j])
+
+    # only the upper triangle is computed, one block of rows at a time
+    for start in range(0, len(unique), BLOCK):
+        scores = matrix[start:start + BLOCK] @ matrix[start:].T
+
+        for i, j in zip(*np.nonzero(scores >= threshold)):
+            a = start + int(i)
+            b = start + int(j)
+            if a < b and unique[a] and levels[a] == levels[b]:
+                score = float(scores[i, j])
+                pairs.extend(
+                    (min(x, y), max(x, y), score)
+                    for x in members[a]
+                    for y in members[b]
+                )
+
+    pairs.sort(key=lambda p: (p[1], p[0]))
+    return pairs
+
+
+def _prereq_name(item):
+    return item.get("name", "") if isinstance(item, dict) else item
+
+
+def merge_duplicates(roadmap, threshold=THRESHOLD):
+
+    # keeps the first occurrence of each course across the whole roadmap;
+    # a dropped duplicate's prerequisites are folded into the kept course
+    # and prerequisites naming it are pointed at the kept one.
+    # Returns (roadmap, [(dropped name, kept name, score)]).
+    entries = [
+        (sem, c)
+        for sem in roadmap.get("semesters", [])
+        for c in sem.get("courses", [])
+    ]
+
+    kept_as = {}
+    merged = []
+
+    for a, b, score in near_duplicates([c.get("name", "") for _, c in entries], threshold):
+        if b in kept_as:
+            continue
+        target = kept_as.get(a, a)
+        kept_as[b] = target
+
+        keep = entries[target][1]
+        drop = entries[b][1]
+        prereqs = keep.setdefault("prerequisites", [])
+        for p in drop.get("prerequisites") or []:
+            if p not in prereqs and p != keep.get("name"):
+                prereqs.append(p)
+
+        merged.append((drop.get("name", ""), keep.get("name", ""), round(score, 3)))
+
+    if not merged:
+        return roadmap, merged
+
+    renamed = {
+        course_key(entries[b][1].get("name", "")): entries[target][1].get("name", "")
+        for b, target in kept_as.items()
+    }
+    dropped = {id(entries[b][1]) for b in kept_as}
+
+    for sem in roadmap.get("semesters", []):
+        courses = sem.get("courses", [])
+        sem["courses"] = [c for c in courses if id(c) not in dropped]
+
+        if len(sem["courses"]) != len(courses) and "total_credits" in sem:
+            sem["total_credits"] = sum(as_credits(c.get("credits")) for c in sem["courses"])
+
+        for c in sem["courses"]:
+            items = c.get("prerequisites")
+            if not isinstance(items, list):
+                continue
+
+            own = course_key(c.get("name", ""))
+            prereqs = []
+            for item in items:
+                key = course_key(_prereq_name(item))
+                name = renamed.get(key)
+                if name is not None:
+                    key = course_key(name)
+                    item = name
+                if key != own and key not in {course_key(_prereq_name(p)) for p in prereqs}:
+                    prereqs.append(item)
+            c["prerequisites"] = prereqs
+
+    return roadmap, merged
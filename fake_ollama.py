@@ -0,0 +1,256 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =====================================================
+# FAKE OLLAMA SERVER
+# =====================================================
+#
+#   python fake_ollama.py --port 11435 --latency 0.2 --tps 40
+#
+# Stand-in for /api/generate that answers every planner prompt with a
+# canned, well-formed JSON payload (or plain text for chat). Latency is
+# a fixed time to first token plus len(tokens) / tps, with optional
+# jitter; both streaming (NDJSON) and non-streaming replies carry the
+# same eval_count / *_duration fields as the real server. Point a planner
+# or benchmark.py at it through OLLAMA_URL / --url.
+
+DEFAULT_PORT = 11435
+TOKEN_CHARS = 4
+
+
+class FakeConfig:
+
+    def __init__(self, latency=0.1, tps=50.0, jitter=0.0, error_rate=0.0,
+                 payloads=None, seed=0):
+        self.latency = latency
+        self.tps = tps
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.payloads = payloads or {}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def roll(self):
+        with self.lock:
+            return self.random.random()
+
+
+# =====================================================
+# CANNED ANSWERS
+# =====================================================
+
+def _number(pattern, prompt, default):
+    match = re.search(pattern, prompt)
+    return int(match.group(1)) if match else default
+
+
+def _courses(number, count=4):
+    return [
+        {
+            "name": f"Course {number}.{i}",
+            "difficulty": ["Easy", "Medium", "Hard"][i % 3],
+            "credits": 3 + i % 2,
+            "prerequisites": [f"Course {number - 1}.{i}"] if number > 1 else []
+        }
+        for i in range(count)
+    ]
+
+
+def _semester(number):
+    return {
+        "semester_number": number,
+        "total_credits": sum(c["credits"] for c in _courses(number)),
+        "summary": f"Semester {number} summary",
+        "courses": _courses(number)
+    }
+
+
+def canned_answer(prompt, payloads=None):
+
+    # explicit payloads win: {"substring in prompt": response object}
+    for needle, answer in (payloads or {}).items():
+        if needle in prompt:
+            return answer if isinstance(answer, str) else json.dumps(answer)
+
+    if "Outline the semester" in prompt:
+        count = _number(r"Semesters: (\d+)", prompt, 8)
+        return json.dumps({"semesters": [
+            {"semester_number": n, "theme": f"Theme {n}"} for n in range(1, count + 1)
+        ]})
+
+    if "ONE semester" in prompt:
+        return json.dumps(_semester(_number(r"Semester: (\d+)", prompt, 1)))
+
+    if '"operations"' in prompt:
+        return json.dumps({
+            "operations": [{"op": "add", "semester": 1, "course": {
+                "name": "Suggested Course", "difficulty": "Medium",
+                "credits": 3, "prerequisites": []
+            }}],
+            "reason": "Fits the first semester"
+        })
+
+    if '"semesters"' in prompt:
+        count = _number(r"Semesters: (\d+)", prompt, 8)
+        return json.dumps({"semesters": [_semester(n) for n in range(1, count + 1)]})
+
+    if '"sessions"' in prompt:
+        return json.dumps({"sessions": [
+            {"session_number": n, "topic": f"Topic {n}", "description": f"Session {n}"}
+            for n in range(1, 9)
+        ]})
+
+    if "predicted_level" in prompt:
+        return json.dumps({"predicted_level": "Intermediate", "reason": "Canned answer"})
+
+    return "This is a canned answer from the fake Ollama server. " * 4
+
+
+def _tokens(text):
+    return [text[i:i + TOKEN_CHARS] for i in range(0, len(text), TOKEN_CHARS)] or [""]
+
+
+# =====================================================
+# HTTP HANDLER
+# =====================================================
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    config = FakeConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": []})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        config = self.config
+        start = time.perf_counter()
+
+        if config.error_rate and config.roll() < config.error_rate:
+            self._send_json(503, {"error": "fake overload"})
+            return
+
+        text = canned_answer(body.get("prompt", ""), config.payloads)
+        tokens = _tokens(text)
+        latency = config.latency * (1 + config.jitter * (2 * config.roll() - 1))
+        per_token = 1.0 / config.tps if config.tps > 0 else 0.0
+
+        time.sleep(max(0.0, latency))
+        first = time.perf_counter()
+
+        def stats():
+            done = time.perf_counter()
+            return {
+                "model": body.get("model", ""),
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((done - start) * 1e9),
+                "load_duration": 0,
+                "prompt_eval_count": len(_tokens(body.get("prompt", ""))),
+                "prompt_eval_duration": int((first - start) * 1e9),
+                "eval_count": len(tokens),
+                "eval_duration": int((done - first) * 1e9)
+            }
+
+        if body.get("stream", True) is False:
+            time.sleep(per_token * len(tokens))
+            self._send_json(200, dict(stats(), response=text))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(obj):
+            data = (json.dumps(obj) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        for token in tokens:
+            time.sleep(per_token)
+            chunk({"model": body.get("model", ""), "response": token, "done": False})
+
+        chunk(dict(stats(), response=""))
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, config=None):
+
+    # starts the server on a daemon thread; returns (server, generate url)
+    handler = type("Handler", (FakeOllamaHandler,), {"config": config or FakeConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/api/generate"
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/generate server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="seconds before the first token")
+    parser.add_argument("--tps", type=float, default=50.0,
+                        help="tokens per second after the first one (0 = instant)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="relative +/- jitter applied to --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--payloads",
+                        help="JSON file mapping prompt substrings to responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = None
+    if args.payloads:
+        with open(args.payloads, encoding="utf-8") as f:
+            payloads = json.load(f)
+
+    config = FakeConfig(args.latency, args.tps, args.jitter, args.error_rate, payloads, args.seed)
+    server, url = serve(args.host, args.port, config)
+    print(f"fake Ollama listening on {url}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# =====================================================
+# BACKGROUND JOB QUEUE
+# =====================================================
+#
+# Long generations run here instead of inside the Streamlit script, so a
+# widget click or page switch does not throw the work away. Pages keep
+# only the job id in st.session_state and poll the job on every rerun.
+# Task functions must not call st.*; they get the Job as first argument
+# and may append partial results to job.progress (and set job.total).
+
+class Job:
+
+    def __init__(self, job_id, key=None, label=""):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        self.progress = []
+        self.total = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobQueue:
+
+    def __init__(self, workers=4, keep=200):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, key=None, label="", **kwargs):
+
+        # a second click on the same generation joins the running job
+        with self._lock:
+            if key is not None and key in self._active:
+                return self._active[key]
+
+            job = Job(uuid.uuid4().hex[:12], key, label)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active[key] = job.id
+            self._trim()
+
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = "running"
+        job.started = time.time()
+
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            job.error = e
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                if self._active.get(job.key) == job.id:
+                    del self._active[job.key]
+
+    def get(self, job_id):
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def running(self):
+        with self._lock:
+            return [j for j in self._jobs.values() if not j.done]
+
+    def _trim(self):
+        finished = [j.id for j in self._jobs.values() if j.done]
+        for job_id in finished[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,163 @@
+import json
+
+# =====================================================
+# INCREMENTAL JSON ARRAY PARSER
+# =====================================================
+#
+# Scans model output as it streams in and returns every element of the
+# array stored under `key` (e.g. "semesters") of the top-level object as
+# soon as its closing brace arrives, without waiting for the rest of the
+# document. A key of the same name in a nested object is ignored.
+
+class ArrayItemParser:
+
+    def __init__(self, key):
+        self.key = key
+        self.text = ""
+        self.done = False
+
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._array_depth = None
+        self._item_start = None
+
+    def feed(self, chunk):
+        self.text += chunk
+        text = self.text
+        items = []
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+
+            elif ch == "[" or ch == "{":
+                if (
+                    ch == "["
+                    and not self.done
+                    and self._array_depth is None
+                    and self._last_string == self.key
+                    and self._stack == ["{"]
+                ):
+                    self._array_depth = len(self._stack) + 1
+
+                elif (
+                    ch == "{"
+                    and self._array_depth is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    self._item_start = i
+
+                self._stack.append(ch)
+                self._last_string = None
+
+            elif ch == "]" or ch == "}":
+                if self._stack:
+                    self._stack.pop()
+
+                if (
+                    ch == "}"
+                    and self._item_start is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    try:
+                        items.append(json.loads(text[self._item_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+
+                elif (
+                    ch == "]"
+                    and self._array_depth is not None
+                    and len(self._stack) == self._array_depth - 1
+                ):
+                    self._array_depth = None
+                    self.done = True
+
+            elif ch == ",":
+                self._last_string = None
+
+        self._pos = len(text)
+        return items
+
+
+# =====================================================
+# TRUNCATED JSON REPAIR
+# =====================================================
+#
+# A reply cut off by the output limit is rolled back to the last point
+# where every value was complete (a comma, or just after an opening or
+# closing bracket), the brackets still open there are closed and that
+# prefix is parsed. An unterminated string is first tried closed as is.
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text):
+
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("no JSON object in reply")
+
+    stack = []
+    cuts = []
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+
+        elif ch == "{" or ch == "[":
+            stack.append(ch)
+            cuts.append((text[start:i + 1], "".join(stack)))
+
+        elif ch == "}" or ch == "]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return json.loads(text[start:i + 1])
+            cuts.append((text[start:i + 1], "".join(stack)))
+
+        elif ch == ",":
+            cuts.append((text[start:i], "".join(stack)))
+
+    if in_string:
+        tail = text[start:len(text) - 1] if escape else text[start:]
+        cuts.append((tail + '"', "".join(stack)))
+
+    for prefix, open_brackets in reversed(cuts):
+        closing = "".join(CLOSERS[c] for c in reversed(open_brackets))
+        try:
+            return json.loads(prefix + closing)
+        except ValueError:
+            continue
+
+    raise ValueError("could not repair JSON reply")
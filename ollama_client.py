@@ -0,0 +1,205 @@
+import json
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from telemetry import record
+
+# =====================================================
+# CONFIG
+# =====================================================
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+POOL_SIZE = 8
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# (connect, read) timeouts in seconds per call type
+TIMEOUTS = {
+    "default": (3.05, 120),
+    "capability": (3.05, 60),
+    "roadmap": (3.05, 300),
+    "outline": (3.05, 60),
+    "semester": (3.05, 120),
+    "modify": (3.05, 120),
+    "sessions": (3.05, 120),
+    "chat": (3.05, 120),
+    "warmup": (3.05, 300),
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class OllamaError(Exception):
+    pass
+
+
+# =====================================================
+# POOLED CLIENT
+# =====================================================
+
+class OllamaClient:
+
+    def __init__(
+        self,
+        url=OLLAMA_URL,
+        pool_size=POOL_SIZE,
+        timeouts=None,
+        max_retries=MAX_RETRIES,
+        keep_alive=None
+    ):
+        self.url = url
+        self.keep_alive = keep_alive
+        self.timeouts = dict(TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+        # one keep-alive pool shared by every Streamlit session
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def timeout_for(self, call_type):
+        return self.timeouts.get(call_type, self.timeouts["default"])
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def _track(self, delta):
+        with self._in_flight_lock:
+            self.in_flight += delta
+
+    def post(self, payload, call_type="default", stream=False):
+        start = time.perf_counter()
+        model = payload.get("model", "")
+
+        # every request renews how long Ollama keeps the model loaded
+        if self.keep_alive is not None and "keep_alive" not in payload:
+            payload = dict(payload, keep_alive=self.keep_alive)
+
+        # a streamed request stays in flight until stream() finishes reading
+        self._track(1)
+        try:
+            response = self._send(payload, call_type, stream)
+        except OllamaError as e:
+            self._track(-1)
+            record(call_type, model, time.perf_counter() - start, error=e)
+            raise
+        if not stream:
+            self._track(-1)
+
+        # streamed calls are recorded by stream() once the final chunk arrives
+        if not stream:
+            wall = time.perf_counter() - start
+
+            if response.status_code != 200:
+                record(call_type, model, wall, error=f"HTTP {response.status_code}")
+            else:
+                try:
+                    result = response.json()
+                except ValueError:
+                    result = None
+                record(call_type, model, wall, result=result)
+
+        return response
+
+    def _send(self, payload, call_type, stream):
+        timeout = self.timeout_for(call_type)
+        error = None
+
+        for attempt in range(self.max_retries + 1):
+
+            if attempt:
+                time.sleep(self.backoff(attempt - 1))
+
+            try:
+                response = self.session.post(
+                    self.url,
+                    json=payload,
+                    timeout=timeout,
+                    stream=stream
+                )
+            except requests.ConnectTimeout as e:
+                error = e
+                continue
+            except requests.Timeout as e:
+                # the model accepted the request but stalled; retrying would
+                # only queue another full generation behind it
+                raise OllamaError(f"{call_type} request timed out") from e
+            except requests.ConnectionError as e:
+                error = e
+                continue
+
+            if response.status_code in RETRY_STATUS:
+                error = OllamaError(
+                    f"HTTP {response.status_code}: {response.text[:200]}"
+                )
+                response.close()
+                continue
+
+            return response
+
+        raise OllamaError(
+            f"{call_type} request failed after {self.max_retries + 1} attempts: {error}"
+        )
+
+    def stream(self, payload, call_type="default"):
+        payload = dict(payload, stream=True)
+        model = payload.get("model", "")
+        start = time.perf_counter()
+        first_token = None
+
+        response = self.post(payload, call_type, stream=True)
+
+        try:
+            with response:
+
+                if response.status_code != 200:
+                    record(call_type, model, time.perf_counter() - start,
+                           error=f"HTTP {response.status_code}")
+                    raise OllamaError(
+                        f"HTTP {response.status_code}: {response.text[:200]}"
+                    )
+
+                # Ollama streams one JSON object per line (NDJSON); a stall or
+                # a dropped connection mid-reply surfaces as OllamaError too
+                try:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+
+                        chunk = json.loads(line)
+
+                        if chunk.get("error"):
+                            record(call_type, model, time.perf_counter() - start,
+                                   error=chunk["error"])
+                            raise OllamaError(chunk["error"])
+
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+
+                        if chunk.get("done"):
+                            record(call_type, model, time.perf_counter() - start,
+                                   result=chunk, first_token=first_token)
+
+                        yield chunk
+
+                        if chunk.get("done"):
+                            break
+                except (requests.RequestException, ValueError) as e:
+                    record(call_type, model, time.perf_counter() - start, error=e)
+                    raise OllamaError(f"{call_type} stream broke off: {e}") from e
+
+        finally:
+            self._track(-1)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,75 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Saves a user's plan (inputs, capability, roadmap, generated sessions,
+# the open semester) under a short plan ID so a refresh or a server
+# restart reloads it instead of regenerating it. Each field is its own
+# JSON row, so saving after an edit only rewrites the field that changed.
+
+PLAN_DB_PATH = os.environ.get(
+    "PLAN_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".plans.sqlite3")
+)
+
+
+def new_plan_id():
+    return uuid.uuid4().hex[:10]
+
+
+# =====================================================
+# SQLITE PLAN STORE
+# =====================================================
+
+class PlanStore:
+
+    def __init__(self, path=PLAN_DB_PATH):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plan_fields (
+                plan_id TEXT,
+                field TEXT,
+                value TEXT,
+                updated REAL,
+                PRIMARY KEY (plan_id, field)
+            )
+        """)
+        self._conn.commit()
+
+    def save(self, plan_id, fields):
+        now = time.time()
+        rows = [
+            (plan_id, name, json.dumps(value, ensure_ascii=False), now)
+            for name, value in fields.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO plan_fields VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def load(self, plan_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT field, value FROM plan_fields WHERE plan_id = ?",
+                (plan_id,)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        return {field: json.loads(value) for field, value in rows}
@@ -1,7 +1,11 @@
 import streamlit as st
 import google.generativeai as genai
 import json
-import random
+import time
+
+from ai_cache import cache_get, cache_put
+from telemetry import record
+from timetable import generate_timetable
 
 # --------------------------------------------------
 # CONFIG
@@ -36,18 +40,39 @@ if "capability" not in st.session_state:
 # SAFE GEMINI JSON FUNCTION (FIXED)
 # --------------------------------------------------
 
-def call_gemini_json(prompt, model=model_pro):
+def call_gemini_json(prompt, model=model_pro, call_type="default"):
+
+    raw = None
 
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.2,
-                "response_mime_type": "application/json"
-            }
-        )
+        generation_config = {
+            "temperature": 0.2,
+            "response_mime_type": "application/json"
+        }
+
+        cached = cache_get(model.model_name, prompt, generation_config, call_type=call_type)
+
+        if cached is not None:
+            text = cached
+        else:
+            start = time.perf_counter()
+            try:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=generation_config
+                )
+                raw = response.text
+            except Exception as e:
+                record(call_type, model.model_name, time.perf_counter() - start, error=e)
+                raise
+
+            usage = getattr(response, "usage_metadata", None)
+            record(call_type, model.model_name, time.perf_counter() - start, result={
+                "prompt_eval_count": getattr(usage, "prompt_token_count", None),
+                "eval_count": getattr(usage, "candidates_token_count", None)
+            })
 
-        text = response.text.strip()
+            text = raw.strip()
 
         # Remove markdown if present
         if text.startswith("```"):
@@ -60,12 +85,17 @@ def call_gemini_json(prompt, model=model_pro):
         if start != -1 and end != -1:
             text = text[start:end+1]
 
-        return json.loads(text)
+        data = json.loads(text)
+
+        if cached is None:
+            cache_put(model.model_name, prompt, text, generation_config)
+
+        return data
 
     except Exception as e:
         st.error("AI returned invalid JSON")
         st.write("Raw Output:")
-        st.code(response.text if 'response' in locals() else "No response")
+        st.code(raw if raw is not None else "No response")
         return None
 
 
@@ -121,7 +151,7 @@ Return:
 }}
 """
 
-        result = call_gemini_json(prompt)
+        result = call_gemini_json(prompt, call_type="capability")
 
         if result:
             st.session_state.capability = result
@@ -170,7 +200,7 @@ Format:
 }}
 """
 
-    return call_gemini_json(prompt)
+    return call_gemini_json(prompt, call_type="roadmap")
 
 
 # --------------------------------------------------
@@ -243,33 +273,7 @@ Course: {course}
 }}
 """
 
-    return call_gemini_json(prompt, model_flash)
-
-
-# --------------------------------------------------
-# TIMETABLE
-# --------------------------------------------------
-
-def generate_timetable(courses, weekly_hours):
-
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-    table = {d: [] for d in days}
-
-    if not courses:
-        return table
-
-    per = max(1, weekly_hours // len(courses))
-
-    for course in courses:
-        chosen = random.sample(days, 2)
-
-        for d in chosen:
-            table[d].append({
-                "course": course["name"],
-                "hours": per // 2
-            })
-
-    return table
+    return call_gemini_json(prompt, model_flash, call_type="sessions")
 
 
 # --------------------------------------------------
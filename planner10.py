@@ -1,8 +1,15 @@
 import streamlit as st
-import requests
-import json
 import random
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from ai_cache import cache_get, cache_put
+from curriculum import AIJSONError, fetch_ai
+from ollama_client import OllamaClient, OllamaError
+from router import get_router, stream_with_fallback
 
 # --------------------------------------------------
 # CONFIG
@@ -11,7 +18,14 @@ import pandas as pd
 st.set_page_config(page_title="AI Academic Ecosystem", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+SESSION_COUNT = 6
+SESSION_WORKERS = 4
+
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
 
 # --------------------------------------------------
 # SESSION STATE
@@ -39,42 +53,66 @@ if "session_store" not in st.session_state:
 # OLLAMA CALL (JSON)
 # --------------------------------------------------
 
-def call_ai(prompt):
-    response = requests.post(
-        OLLAMA_URL,
-        json={"model": MODEL, "prompt": prompt, "stream": False}
-    )
-    text = response.json()["response"]
+def call_ai(prompt, call_type="default", expected=None):
     try:
-        start = text.find("{")
-        end = text.rfind("}")
-        clean = text[start:end+1]
-        return json.loads(clean)
-    except:
+        return fetch_ai(get_client(), prompt, call_type=call_type, expected=expected)
+    except AIJSONError as e:
         st.error("AI returned invalid JSON")
-        st.code(text)
+        st.code(e.text)
         return None
+    except OllamaError as e:
+        st.error(f"Ollama request failed: {e}")
+        return None
+
+# --------------------------------------------------
+# PARALLEL FAN-OUT
+# --------------------------------------------------
+
+def run_parallel(fn, items, workers):
+    # yields (item, result, error) as each call finishes
+    ctx = get_script_run_ctx()
+
+    def attach():
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items))), initializer=attach) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except (OllamaError, AIJSONError) as e:
+                yield futures[future], None, e
 
 # --------------------------------------------------
-# NORMAL CHAT CALL
+# STREAMING CHAT CALL
 # --------------------------------------------------
 
-def call_chat(prompt):
-    response = requests.post(
-        OLLAMA_URL,
-        json={"model": MODEL, "prompt": prompt, "stream": False}
-    )
-    return response.json()["response"]
+def stream_chat(prompt):
+    model, profile = get_router().route("chat")
+    cached = cache_get(model, prompt, profile, call_type="chat")
+    if cached is not None:
+        yield cached
+        return
+    reply = ""
+    for model, chunk in stream_with_fallback(
+        get_client(),
+        {"model": model, "prompt": prompt, "options": profile},
+        "chat"
+    ):
+        token = chunk.get("response", "")
+        reply += token
+        yield token
+    cache_put(model, prompt, reply, profile)
 
 # --------------------------------------------------
 # SESSION GENERATOR
 # --------------------------------------------------
 
-def generate_sessions(course):
-    prompt = f"""
+def sessions_prompt(course):
+    return f"""
 Return only JSON.
 
-Break the course into 6 learning sessions.
+Break the course into {SESSION_COUNT} learning sessions.
 
 Course: {course}
 
@@ -89,7 +127,12 @@ Format:
  ]
 }}
 """
-    return call_ai(prompt)
+
+def generate_sessions(course):
+    return call_ai(sessions_prompt(course), call_type="sessions", expected=SESSION_COUNT)
+
+def fetch_sessions(course):
+    return fetch_ai(get_client(), sessions_prompt(course), call_type="sessions", expected=SESSION_COUNT)
 
 # --------------------------------------------------
 # TIMETABLE GENERATOR
@@ -170,7 +213,7 @@ Format:
  ]
 }}
 """
-    return call_ai(prompt)
+    return call_ai(prompt, call_type="roadmap", expected=semesters)
 
 # --------------------------------------------------
 # PAGE 2 COURSE PLANNER
@@ -236,6 +279,19 @@ def page_semester():
 
     # SESSIONS
     with tab2:
+        store = st.session_state.session_store
+        pending = [c["name"] for c in sem["courses"] if c["name"] not in store]
+
+        if pending and st.button(f"Generate Sessions for Whole Semester ({len(pending)} courses)"):
+            progress = st.progress(0.0, text="Generating sessions...")
+            results = run_parallel(fetch_sessions, pending, SESSION_WORKERS)
+            for done, (name, result, error) in enumerate(results, start=1):
+                if error:
+                    st.error(f"{name}: {error}")
+                else:
+                    store[name] = result.get("sessions", [])
+                progress.progress(done / len(pending), text=f"{done}/{len(pending)} courses done")
+
         for c in sem["courses"]:
             if st.button(f"Generate Sessions - {c['name']}"):
                 result = generate_sessions(c["name"])
@@ -284,9 +340,18 @@ def page_chatbot():
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        reply = call_chat(prompt)
         with st.chat_message("assistant"):
-            st.markdown(reply)
+            placeholder = st.empty()
+            reply = ""
+            try:
+                for token in stream_chat(prompt):
+                    reply += token
+                    placeholder.markdown(reply + "▌")
+            except OllamaError as e:
+                placeholder.markdown(reply)
+                st.error(f"Ollama request failed: {e}")
+                return
+            placeholder.markdown(reply)
 
         st.session_state.messages.append({"role":"assistant","content":reply})
 
@@ -1,7 +1,11 @@
 import streamlit as st
-import requests
 import json
-import random
+
+from ai_cache import cache_get, cache_put
+from dedupe import merge_duplicates
+from ollama_client import OllamaClient, OllamaError
+from router import get_router, post_with_fallback
+from timetable import generate_timetable
 
 # -----------------------------
 # CONFIG
@@ -10,7 +14,12 @@ import random
 st.set_page_config(page_title="AI Academic Ecosystem", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
 
 # -----------------------------
 # SESSION STATE
@@ -33,18 +42,35 @@ if "current_semester" not in st.session_state:
 # OLLAMA JSON CALL
 # -----------------------------
 
-def call_ai(prompt):
-    response = requests.post(
-        OLLAMA_URL,
-        json={"model": MODEL, "prompt": prompt, "stream": False}
-    )
-    text = response.json()["response"]
+def call_ai(prompt, call_type="default"):
+    model, profile = get_router().route(call_type)
+    cached = cache_get(model, prompt, profile, call_type=call_type)
+    if cached is None:
+        try:
+            response, model = post_with_fallback(
+                get_client(),
+                {"model": model, "prompt": prompt, "stream": False, "options": profile},
+                call_type
+            )
+        except OllamaError as e:
+            st.error(f"Ollama request failed: {e}")
+            return None
+        if response.status_code != 200:
+            st.error(f"Ollama request failed: HTTP {response.status_code}")
+            st.code(response.text)
+            return None
+        text = response.json()["response"]
+    else:
+        text = cached
 
     try:
         start = text.find("{")
         end = text.rfind("}")
         clean = text[start:end+1]
-        return json.loads(clean)
+        data = json.loads(clean)
+        if cached is None:
+            cache_put(model, prompt, text, profile)
+        return data
     except:
         st.error("AI returned invalid JSON")
         st.code(text)
@@ -56,15 +82,10 @@ def call_ai(prompt):
 # -----------------------------
 
 def validate_and_balance(roadmap):
-    all_courses = set()
+    roadmap, merged = merge_duplicates(roadmap)
 
-    for sem in roadmap["semesters"]:
-        filtered = []
-        for c in sem["courses"]:
-            if c["name"] not in all_courses:
-                filtered.append(c)
-                all_courses.add(c["name"])
-        sem["courses"] = filtered
+    for dropped, kept, score in merged:
+        st.info(f"Merged duplicate course '{dropped}' into '{kept}' (similarity {score})")
 
     return roadmap
 
@@ -117,7 +138,7 @@ Return:
 }}
 """
 
-        result = call_ai(prompt)
+        result = call_ai(prompt, call_type="capability")
 
         if result:
             st.success("Capability Predicted")
@@ -167,7 +188,7 @@ Format:
 }}
 """
 
-    result = call_ai(prompt)
+    result = call_ai(prompt, call_type="roadmap")
     if result:
         return validate_and_balance(result)
     return None
@@ -228,7 +249,7 @@ Return:
   "reason": ""
 }}
 """
-            result = call_ai(prompt)
+            result = call_ai(prompt, call_type="modify")
 
             if result:
                 st.write("AI Opinion:", result["reason"])
@@ -287,30 +308,7 @@ Course: {course}
  ]
 }}
 """
-    return call_ai(prompt)
-
-
-# -----------------------------
-# SMART TIMETABLE
-# -----------------------------
-
-def generate_timetable(courses, weekly_hours):
-
-    days = ["Mon","Tue","Wed","Thu","Fri","Sat"]
-    table = {d: [] for d in days}
-
-    total_courses = len(courses)
-    hours_per = weekly_hours // max(1,total_courses)
-
-    for c in courses:
-        chosen = random.sample(days, 2)
-        for d in chosen:
-            table[d].append({
-                "course": c["name"],
-                "hours": hours_per // 2
-            })
-
-    return table
+    return call_ai(prompt, call_type="sessions")
 
 
 # -----------------------------
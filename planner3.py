@@ -1,7 +1,10 @@
 import streamlit as st
-import requests
 import json
-import random
+
+from ai_cache import cache_get, cache_put
+from ollama_client import OllamaClient, OllamaError
+from router import get_router, post_with_fallback
+from timetable import generate_timetable
 
 # =====================================================
 # CONFIG
@@ -10,36 +13,58 @@ import random
 st.set_page_config(page_title="AI Academic Planning System", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
 
 # =====================================================
 # AI JSON CALL
 # =====================================================
 
-def call_ai(prompt, temperature=0.2):
+def call_ai(prompt, temperature=0.2, call_type="default"):
     try:
-        payload = {
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False,
-            "format": "json",
-            "options": {"temperature": temperature}
-        }
+        model, profile = get_router().route(call_type)
+        profile["temperature"] = temperature
+        options = dict(profile, format="json")
+        cached = cache_get(model, prompt, options, call_type=call_type)
+
+        if cached is not None:
+            text = cached
+        else:
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+                "options": profile
+            }
+
+            response, model = post_with_fallback(get_client(), payload, call_type)
+
+            if response.status_code != 200:
+                st.error("AI request failed")
+                st.code(response.text)
+                return None
+
+            result = response.json()
+            text = result.get("response", "").strip()
 
-        response = requests.post(OLLAMA_URL, json=payload)
+        if text.startswith("```"):
+            text = text.replace("```json", "").replace("```", "").strip()
 
-        if response.status_code != 200:
-            st.error("AI request failed")
-            st.code(response.text)
-            return None
+        data = json.loads(text)
 
-        result = response.json()
-        text = result.get("response", "").strip()
+        if cached is None:
+            cache_put(model, prompt, text, options)
 
-        if text.startswith("```"):
-            text = text.replace("```json", "").replace("```", "").strip()
+        return data
 
-        return json.loads(text)
+    except OllamaError as e:
+        st.error(f"AI request failed: {e}")
+        return None
 
     except Exception:
         st.error("Invalid JSON returned by AI")
@@ -117,7 +142,7 @@ Total Study Hours: {total_hours}
 }}
 """
 
-        result = call_ai(prompt)
+        result = call_ai(prompt, call_type="capability")
 
         if result:
             st.session_state.capability = result
@@ -170,7 +195,7 @@ Return:
  ]
 }}
 """
-    return call_ai(prompt)
+    return call_ai(prompt, call_type="roadmap")
 
 
 def page_course_planning():
@@ -220,7 +245,7 @@ You must:
 Return updated roadmap in same structure.
 """
 
-            updated = call_ai(prompt)
+            updated = call_ai(prompt, call_type="modify")
 
             if updated:
                 st.session_state.roadmap = updated
@@ -283,28 +308,7 @@ Course: {course_name}
  ]
 }}
 """
-    return call_ai(prompt)
-
-
-def generate_timetable(courses, weekly_hours):
-
-    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-    table = {d: [] for d in days}
-
-    if not courses:
-        return table
-
-    per_course = weekly_hours / len(courses)
-
-    for c in courses:
-        chosen = random.sample(days, 2)
-        for d in chosen:
-            table[d].append({
-                "course": c["name"],
-                "hours": round(per_course / 2, 1)
-            })
-
-    return table
+    return call_ai(prompt, call_type="sessions")
 
 
 def page_semester_view():
@@ -1,7 +1,12 @@
 import streamlit as st
-import requests
 import json
-import random
+
+from ai_cache import cache_get, cache_put
+from balancer import balance_roadmap
+from ollama_client import OllamaClient
+from roadmap_model import RoadmapModel
+from router import get_router, post_with_fallback
+from timetable import generate_timetable
 
 # =====================================================
 # CONFIG
@@ -10,35 +15,51 @@ import random
 st.set_page_config(page_title="AI Academic Planning", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
 MAX_CREDITS = 24
 
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
+
 # =====================================================
 # SAFE AI CALL
 # =====================================================
 
-def call_ai(prompt):
+def call_ai(prompt, call_type="default"):
     try:
-        payload = {
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False,
-            "options": {"temperature": 0.2}
-        }
+        model, options = get_router().route(call_type)
+        cached = cache_get(model, prompt, options, call_type=call_type)
 
-        r = requests.post(OLLAMA_URL, json=payload, timeout=120)
+        if cached is not None:
+            text = cached
+        else:
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+                "options": options
+            }
 
-        if r.status_code != 200:
-            st.error("AI request failed")
-            return None
+            r, model = post_with_fallback(get_client(), payload, call_type)
 
-        data = r.json()
-        text = data.get("response", "").strip()
+            if r.status_code != 200:
+                st.error("AI request failed")
+                return None
+
+            data = r.json()
+            text = data.get("response", "").strip()
 
         if text.startswith("```"):
             text = text.replace("```json", "").replace("```", "").strip()
 
-        return json.loads(text)
+        result = json.loads(text)
+
+        if cached is None:
+            cache_put(model, prompt, text, options)
+
+        return result
 
     except:
         st.error("AI returned invalid output")
@@ -61,24 +82,36 @@ if "roadmap" not in st.session_state:
 if "current_sem" not in st.session_state:
     st.session_state.current_sem = None
 
+if "roadmap_model" not in st.session_state:
+    st.session_state.roadmap_model = None
+
 
 # =====================================================
 # UTILITIES
 # =====================================================
 
-def total_credits(sem):
-    total = 0
-    for cat in ["mandatory", "recommended", "optional"]:
-        for c in sem.get(cat, []):
-            total += c.get("credits", 0)
-    return total
+def get_model():
 
+    # rebuilt only when the roadmap object itself is replaced
+    model = st.session_state.roadmap_model
+    if model is None or model.roadmap is not st.session_state.roadmap:
+        model = RoadmapModel(st.session_state.roadmap)
+        st.session_state.roadmap_model = model
+    return model
 
-def lightest_semester(roadmap):
-    loads = []
-    for sem in roadmap.get("semesters", []):
-        loads.append((sem["semester_number"], total_credits(sem)))
-    return min(loads, key=lambda x: x[1])[0]
+
+def rebalance(model):
+
+    # the balancer works on a copy; its moves are replayed through the
+    # model so the totals stay current and the model is not rebuilt
+    _, moves = balance_roadmap(model.roadmap, MAX_CREDITS, fields=model.categories)
+
+    for course, source, target in moves:
+        for category in model.categories:
+            if model.move(course, category, source, target) is not None:
+                break
+
+    return moves
 
 
 # =====================================================
@@ -130,7 +163,7 @@ Total Study Hours: {total_hours}
 }}
 """
 
-        result = call_ai(prompt)
+        result = call_ai(prompt, call_type="capability")
 
         if result:
             st.success("Capability Analysis")
@@ -161,7 +194,7 @@ Each semester must include:
  ]
 }}
 """
-                roadmap = call_ai(roadmap_prompt)
+                roadmap = call_ai(roadmap_prompt, call_type="roadmap")
 
                 if roadmap and roadmap.get("semesters"):
                     st.session_state.roadmap = roadmap
@@ -186,11 +219,13 @@ elif st.session_state.step == 2:
 
     st.title("📘 Curriculum Planning")
 
+    model = get_model()
+
     for sem in roadmap.get("semesters", []):
 
         st.subheader(f"Semester {sem['semester_number']}")
 
-        credits = total_credits(sem)
+        credits = model.credits(sem["semester_number"])
         st.write("Total Credits:", credits)
 
         if credits > MAX_CREDITS:
@@ -214,16 +249,23 @@ elif st.session_state.step == 2:
         if not name:
             st.warning("Enter course name")
         else:
-            target = lightest_semester(roadmap)
-
-            for sem in roadmap["semesters"]:
-                if sem["semester_number"] == target:
-                    if total_credits(sem) + credits > MAX_CREDITS:
-                        st.error("Exceeds credit limit")
-                        break
-                    sem[category].append({"name": name, "credits": credits})
-                    st.success(f"Added to Semester {target}")
-                    st.rerun()
+            target = model.place(category, {"name": name, "credits": credits}, MAX_CREDITS)
+
+            if target is None:
+                st.error("Exceeds credit limit")
+            else:
+                st.success(f"Added to Semester {target}")
+                st.rerun()
+
+    if st.button("⚖️ Rebalance Credits"):
+        moves = rebalance(model)
+        if moves:
+            st.session_state.rebalance_moves = moves
+            st.rerun()
+        st.info("Credit load is already balanced")
+
+    for course, source, target in st.session_state.pop("rebalance_moves", []):
+        st.write(f"Moved {course}: Semester {source} → {target}")
 
     if st.button("Continue to Dashboard"):
         st.session_state.step = 3
@@ -240,6 +282,8 @@ elif st.session_state.step == 3:
 
     st.title("📊 Dashboard")
 
+    model = get_model()
+
     for sem in roadmap.get("semesters", []):
 
         if st.button(f"Open Semester {sem['semester_number']}"):
@@ -248,7 +292,7 @@ elif st.session_state.step == 3:
             st.rerun()
 
         st.write(
-            f"Semester {sem['semester_number']} - {total_credits(sem)} credits"
+            f"Semester {sem['semester_number']} - {model.credits(sem['semester_number'])} credits"
         )
 
     if st.button("Back to Planning"):
@@ -296,23 +340,12 @@ Course: {c['name']}
  ]
 }}
 """
-                sessions = call_ai(prompt)
+                sessions = call_ai(prompt, call_type="sessions")
                 if sessions:
                     st.json(sessions)
 
     with tab2:
-        table = {d: [] for d in ["Mon","Tue","Wed","Thu","Fri","Sat"]}
-
-        if all_courses:
-            per = st.session_state.user_data["weekly"] / len(all_courses)
-            for c in all_courses:
-                days = random.sample(list(table.keys()), 2)
-                for d in days:
-                    table[d].append({
-                        "course": c["name"],
-                        "hours": round(per/2,1)
-                    })
-
+        table = generate_timetable(all_courses, st.session_state.user_data["weekly"])
         st.json(table)
 
     if st.button("Back to Dashboard"):
@@ -1,15 +1,24 @@
 import streamlit as st
-import requests
 import json
 import random
 
+from ai_cache import cache_get, cache_put
+from dedupe import merge_duplicates
+from ollama_client import OllamaClient, OllamaError
+from router import get_router, post_with_fallback
+
 # -----------------------------
 # CONFIG
 # -----------------------------
 st.set_page_config(page_title="AI Academic Ecosystem", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
 
 # -----------------------------
 # SESSION STATE INITIALIZATION
@@ -29,23 +38,38 @@ if "finalised_curriculum" not in st.session_state:
 # -----------------------------
 # SAFE AI CALL FUNCTION
 # -----------------------------
-def call_ai(prompt):
+def call_ai(prompt, call_type="default"):
     try:
-        response = requests.post(
-            OLLAMA_URL,
-            json={"model": MODEL, "prompt": prompt, "stream": False},
-            timeout=60
-        )
-        text = response.json().get("response", "")
+        model, profile = get_router().route(call_type)
+        cached = cache_get(model, prompt, profile, call_type=call_type)
+        if cached is None:
+            response, model = post_with_fallback(
+                get_client(),
+                {"model": model, "prompt": prompt, "stream": False, "options": profile},
+                call_type
+            )
+            if response.status_code != 200:
+                st.error(f"Ollama request failed: HTTP {response.status_code}")
+                st.code(response.text)
+                return None
+            text = response.json().get("response", "")
+        else:
+            text = cached
         # Attempt to parse JSON if AI returned extra text
         start = text.find("{")
         end = text.rfind("}")
         if start != -1 and end != -1:
-            return json.loads(text[start:end+1])
+            data = json.loads(text[start:end+1])
+            if cached is None:
+                cache_put(model, prompt, text, profile)
+            return data
         else:
             st.error("AI returned invalid JSON")
             st.code(text)
             return None
+    except OllamaError as e:
+        st.error(f"Ollama request failed: {e}")
+        return None
     except Exception as e:
         st.error(f"Error calling AI: {e}")
         return None
@@ -54,14 +78,9 @@ def call_ai(prompt):
 # VALIDATION & DUPLICATE REMOVAL
 # -----------------------------
 def validate_and_balance(roadmap):
-    all_courses = set()
-    for sem in roadmap.get("semesters", []):
-        filtered = []
-        for c in sem.get("courses", []):
-            if c["name"] not in all_courses:
-                filtered.append(c)
-                all_courses.add(c["name"])
-        sem["courses"] = filtered
+    roadmap, merged = merge_duplicates(roadmap)
+    for dropped, kept, score in merged:
+        st.info(f"Merged duplicate course '{dropped}' into '{kept}' (similarity {score})")
     return roadmap
 
 # -----------------------------
@@ -106,7 +125,7 @@ Return:
   "reason": ""
 }}
 """
-        result = call_ai(prompt)
+        result = call_ai(prompt, call_type="capability")
         if result:
             st.success("Capability Predicted")
             st.json(result)
@@ -155,7 +174,7 @@ Format:
  ]
 }}
 """
-        roadmap = call_ai(prompt)
+        roadmap = call_ai(prompt, call_type="roadmap")
         if roadmap:
             st.session_state.roadmap = validate_and_balance(roadmap)
             st.session_state.current_semester_selected = None
@@ -215,7 +234,7 @@ Modify Semester {sem['semester_number']} courses as per user input:
 
 Preserve prerequisites, balance workload, return JSON with same structure.
 """
-                    updated_sem = call_ai(mod_prompt)
+                    updated_sem = call_ai(mod_prompt, call_type="modify")
                     if updated_sem:
                         st.session_state.current_semester_selected = updated_sem
                         # Also update in main roadmap
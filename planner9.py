@@ -1,8 +1,11 @@
 import streamlit as st
-import requests
-import json
 import random
 
+from ai_cache import cache_get, cache_put
+from curriculum import AIJSONError, fetch_ai
+from ollama_client import OllamaClient, OllamaError
+from router import get_router, stream_with_fallback
+
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
@@ -10,7 +13,13 @@ import random
 st.set_page_config(page_title="AI Academic Ecosystem", layout="wide")
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
-MODEL = "granite3.3:2b"
+SESSION_COUNT = 6
+
+
+@st.cache_resource
+def get_client():
+    return OllamaClient(OLLAMA_URL)
+
 
 # --------------------------------------------------
 # SESSION STATE
@@ -38,46 +47,52 @@ if "session_store" not in st.session_state:
 # OLLAMA CALL (JSON)
 # --------------------------------------------------
 
-def call_ai(prompt):
+def call_ai(prompt, call_type="default", expected=None):
 
-    response = requests.post(
-        OLLAMA_URL,
-        json={
-            "model": MODEL,
-            "prompt": prompt,
-            "stream": False
-        }
-    )
+    # curriculum.fetch_ai does the routing, caching and salvaging; this
+    # only turns its failures into messages on the page
+    try:
+        return fetch_ai(get_client(), prompt, call_type=call_type, expected=expected)
 
-    text = response.json()["response"]
+    except OllamaError as e:
+        st.error(f"Ollama request failed: {e}")
+        return None
 
-    try:
-        start = text.find("{")
-        end = text.rfind("}")
-        clean = text[start:end+1]
-        return json.loads(clean)
-    except:
+    except AIJSONError as e:
         st.error("AI returned invalid JSON")
-        st.code(text)
+        st.code(e.text)
         return None
 
 
 # --------------------------------------------------
-# NORMAL CHAT CALL
+# STREAMING CHAT CALL
 # --------------------------------------------------
 
-def call_chat(prompt):
+def stream_chat(prompt):
 
-    response = requests.post(
-        OLLAMA_URL,
-        json={
-            "model": MODEL,
+    model, profile = get_router().route("chat")
+    cached = cache_get(model, prompt, profile, call_type="chat")
+
+    if cached is not None:
+        yield cached
+        return
+
+    reply = ""
+
+    for model, chunk in stream_with_fallback(
+        get_client(),
+        {
+            "model": model,
             "prompt": prompt,
-            "stream": False
-        }
-    )
+            "options": profile
+        },
+        "chat"
+    ):
+        token = chunk.get("response", "")
+        reply += token
+        yield token
 
-    return response.json()["response"]
+    cache_put(model, prompt, reply, profile)
 
 
 # --------------------------------------------------
@@ -89,7 +104,7 @@ def generate_sessions(course):
     prompt = f"""
 Return only JSON.
 
-Break the course into 6 learning sessions.
+Break the course into {SESSION_COUNT} learning sessions.
 
 Course: {course}
 
@@ -104,7 +119,7 @@ Format:
  ]
 }}
 """
-    return call_ai(prompt)
+    return call_ai(prompt, call_type="sessions", expected=SESSION_COUNT)
 
 
 # --------------------------------------------------
@@ -205,7 +220,7 @@ Format:
 }}
 """
 
-    return call_ai(prompt)
+    return call_ai(prompt, call_type="roadmap", expected=semesters)
 
 
 # --------------------------------------------------
@@ -354,10 +369,21 @@ def page_chatbot():
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        reply = call_chat(prompt)
-
         with st.chat_message("assistant"):
-            st.markdown(reply)
+
+            placeholder = st.empty()
+            reply = ""
+
+            try:
+                for token in stream_chat(prompt):
+                    reply += token
+                    placeholder.markdown(reply + "▌")
+            except OllamaError as e:
+                placeholder.markdown(reply)
+                st.error(f"Ollama request failed: {e}")
+                return
+
+            placeholder.markdown(reply)
 
         st.session_state.messages.append(
             {"role":"assistant","content":reply}
@@ -0,0 +1,123 @@
+# =====================================================
+# PREREQUISITE GRAPH
+# =====================================================
+#
+# Built from the roadmap in one pass over courses and their prerequisite
+# lists (O(V+E)) and checked locally after every generation or edit:
+# cycles, prerequisites placed in the same or a later semester, and
+# prerequisites that are not in the roadmap at all.
+
+def course_key(name):
+    return " ".join(str(name or "").split()).lower()
+
+
+def _prereq_name(item):
+    if isinstance(item, dict):
+        item = item.get("name")
+    return item or ""
+
+
+class PrereqGraph:
+
+    def __init__(self, roadmap):
+        self.semester = {}
+        self.names = {}
+        self.edges = {}
+        self.missing = []
+
+        courses = []
+        for sem in roadmap.get("semesters", []):
+            for c in sem.get("courses", []):
+                key = course_key(c.get("name", ""))
+                if key:
+                    self.semester[key] = sem.get("semester_number")
+                    self.names[key] = c["name"]
+                    courses.append((key, c))
+
+        for key, c in courses:
+            prereqs = self.edges.setdefault(key, [])
+            items = c.get("prerequisites") or []
+
+            for item in items if isinstance(items, list) else [items]:
+                name = _prereq_name(item)
+                other = course_key(name)
+                if not other:
+                    continue
+                if other not in self.semester:
+                    self.missing.append((key, str(name).strip()))
+                elif other not in prereqs:
+                    prereqs.append(other)
+
+    def find_cycles(self):
+
+        # iterative DFS; a grey node reached again closes a cycle
+        state = {}
+        cycles = []
+
+        for root in self.edges:
+            if root in state:
+                continue
+
+            state[root] = 1
+            path = [root]
+            stack = [iter(self.edges[root])]
+
+            while stack:
+                for child in stack[-1]:
+                    seen = state.get(child)
+                    if seen is None:
+                        state[child] = 1
+                        path.append(child)
+                        stack.append(iter(self.edges[child]))
+                        break
+                    if seen == 1:
+                        cycles.append(path[path.index(child):] + [child])
+                else:
+                    state[path.pop()] = 2
+                    stack.pop()
+
+        return cycles
+
+    def order_violations(self):
+
+        # (course, prerequisite) pairs where the prerequisite is not taken
+        # in an earlier semester
+        return [
+            (key, other)
+            for key, prereqs in self.edges.items()
+            for other in prereqs
+            if other != key and _later_or_same(self.semester[other], self.semester[key])
+        ]
+
+
+def _later_or_same(a, b):
+    try:
+        return int(a) >= int(b)
+    except (TypeError, ValueError):
+        return False
+
+
+def validate_roadmap(roadmap):
+
+    graph = PrereqGraph(roadmap)
+    names = graph.names
+    issues = []
+
+    for cycle in graph.find_cycles():
+        issues.append("Prerequisite cycle: " + " -> ".join(names[k] for k in cycle))
+
+    for key, other in graph.order_violations():
+        where = (
+            "the same semester"
+            if graph.semester[other] == graph.semester[key]
+            else f"semester {graph.semester[other]}"
+        )
+        issues.append(
+            f"{names[key]} (semester {graph.semester[key]}) requires "
+            f"{names[other]}, which is in {where}"
+        )
+
+    for key, name in graph.missing:
+        issues.append(f"{names[key]} requires {name}, which is not in the roadmap")
+
+    return issues
@@ -0,0 +1,155 @@
+import cProfile
+import os
+import pstats
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# =====================================================
+# RERUN PROFILER
+# =====================================================
+#
+# Opt-in (PLANNER_PROFILE=1, or the toggle on the Performance page).
+# start_run() / finish_run() wrap one whole script rerun under cProfile
+# and fold the result into a single aggregate pstats.Stats; block(name)
+# times a named sub-block (rendering, timetable, LLM call) and aggregates
+# count / total / max per "page > block" path. Disabled, both are no-ops.
+
+PROFILE_ENABLED = os.environ.get("PLANNER_PROFILE", "0") == "1"
+
+_NOOP = nullcontext()
+
+
+class RerunProfiler:
+
+    def __init__(self, enabled=PROFILE_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._blocks = {}
+        self._stats = None
+        self._runs = 0
+
+        # only one cProfile may be active at a time on newer Pythons, so
+        # concurrent sessions skip the function profile and only get timings
+        self._cprofile_busy = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, path, seconds):
+        with self._lock:
+            b = self._blocks.get(path)
+            if b is None:
+                b = self._blocks[path] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            ms = seconds * 1000
+            b["count"] += 1
+            b["total_ms"] += ms
+            b["max_ms"] = max(b["max_ms"], ms)
+
+    @contextmanager
+    def _timed(self, name):
+        stack = self._stack()
+        stack.append(name)
+        path = " > ".join(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(path, time.perf_counter() - start)
+            stack.pop()
+
+    def block(self, name):
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextmanager
+    def _profiled_run(self, name):
+        profile = None
+        if self._cprofile_busy.acquire(blocking=False):
+            profile = cProfile.Profile()
+            profile.enable()
+
+        try:
+            with self._timed(name):
+                yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._cprofile_busy.release()
+                with self._lock:
+                    self._runs += 1
+                    if self._stats is None:
+                        self._stats = pstats.Stats(profile)
+                    else:
+                        self._stats.add(profile)
+
+    def start_run(self, name="rerun"):
+
+        # for module-level script code that cannot sit inside a with block;
+        # pair with finish_run() in a finally
+        if not self.enabled:
+            return None
+        run = self._profiled_run(name)
+        run.__enter__()
+        return run
+
+    def finish_run(self, run):
+        if run is not None:
+            run.__exit__(None, None, None)
+
+    def summary(self):
+        with self._lock:
+            rows = [
+                dict(
+                    block=path,
+                    count=b["count"],
+                    total_ms=round(b["total_ms"], 2),
+                    avg_ms=round(b["total_ms"] / b["count"], 2),
+                    max_ms=round(b["max_ms"], 2)
+                )
+                for path, b in self._blocks.items()
+            ]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def profiled_runs(self):
+        return self._runs
+
+    def export(self, path):
+
+        # writes the aggregate of every profiled rerun; open it with
+        # pstats / snakeviz
+        with self._lock:
+            if self._stats is None:
+                return False
+            self._stats.dump_stats(path)
+        return True
+
+    def export_bytes(self):
+        fd, path = tempfile.mkstemp(suffix=".pstats")
+        os.close(fd)
+        try:
+            if not self.export(path):
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def reset(self):
+        with self._lock:
+            self._blocks.clear()
+            self._stats = None
+            self._runs = 0
+
+
+_profiler = RerunProfiler()
+
+
+def get_profiler():
+    return _profiler
@@ -0,0 +1,101 @@
+import heapq
+
+from balancer import as_credits
+
+# =====================================================
+# INCREMENTAL ROADMAP MODEL
+# =====================================================
+#
+# Wraps a category-style roadmap (planner4: mandatory / recommended /
+# optional lists per semester) and keeps per-semester and per-category
+# credit totals current as courses are added, moved or removed. A min-heap
+# of (load, semester) with lazy invalidation gives the lightest semester
+# in O(log n), so rendering and placement never rescan the course lists.
+# All edits must go through the model for the totals to stay correct.
+
+CATEGORIES = ("mandatory", "recommended", "optional")
+
+
+def _credits(course):
+    return as_credits(course.get("credits"))
+
+
+class RoadmapModel:
+
+    def __init__(self, roadmap, categories=CATEGORIES):
+        self.roadmap = roadmap
+        self.categories = categories
+        self.semesters = {}
+        self.category_totals = {}
+        self.totals = {}
+        self._heap = []
+
+        for sem in roadmap.get("semesters", []):
+            number = sem["semester_number"]
+            self.semesters[number] = sem
+            self.category_totals[number] = {
+                cat: sum(_credits(c) for c in sem.get(cat, []))
+                for cat in categories
+            }
+            self.totals[number] = sum(self.category_totals[number].values())
+            self._heap.append((self.totals[number], number))
+
+        heapq.heapify(self._heap)
+
+    def credits(self, number):
+        return self.totals[number]
+
+    def category_credits(self, number, category):
+        return self.category_totals[number][category]
+
+    def _adjust(self, number, category, delta):
+        self.category_totals[number][category] += delta
+        self.totals[number] += delta
+        heapq.heappush(self._heap, (self.totals[number], number))
+
+    def lightest(self):
+
+        # entries whose load no longer matches are stale; drop them lazily
+        heap = self._heap
+        while heap and heap[0][0] != self.totals.get(heap[0][1]):
+            heapq.heappop(heap)
+
+        # keep the heap from growing without bound under many edits
+        if len(heap) > 4 * len(self.totals) + 16:
+            self._heap = heap = [(load, n) for n, load in self.totals.items()]
+            heapq.heapify(heap)
+
+        return heap[0][1] if heap else None
+
+    def add(self, number, category, course):
+        self.semesters[number].setdefault(category, []).append(course)
+        self._adjust(number, category, _credits(course))
+
+    def remove(self, number, category, name):
+        courses = self.semesters[number].get(category, [])
+
+        for i, c in enumerate(courses):
+            if c.get("name") == name:
+                del courses[i]
+                self._adjust(number, category, -_credits(c))
+                return c
+
+        return None
+
+    def move(self, name, category, source, target):
+        course = self.remove(source, category, name)
+        if course is not None:
+            self.add(target, category, course)
+        return course
+
+    def place(self, category, course, max_credits):
+
+        # the lightest semester is the only candidate: if it cannot take
+        # the course, no semester can
+        number = self.lightest()
+
+        if number is None or self.totals[number] + _credits(course) > max_credits:
+            return None
+
+        self.add(number, category, course)
+        return number
@@ -0,0 +1,144 @@
+import copy
+
+# =====================================================
+# COMPACT ROADMAP VIEW
+# =====================================================
+#
+# The model only sees one short line per course ("2.1 Data Structures
+# [4cr, Medium]") and answers with a few add / move / remove operations,
+# which are applied and validated locally.
+
+def course_id(semester_number, index):
+    return f"{semester_number}.{index}"
+
+
+def compact_view(roadmap):
+    lines = []
+
+    for sem in roadmap.get("semesters", []):
+        lines.append(f"Semester {sem['semester_number']}:")
+        for i, c in enumerate(sem.get("courses", [])):
+            lines.append(
+                f"  {course_id(sem['semester_number'], i)} {c.get('name', '')}"
+                f" [{c.get('credits', '?')}cr, {c.get('difficulty', '?')}]"
+            )
+
+    return "\n".join(lines)
+
+
+# =====================================================
+# PATCH APPLICATION
+# =====================================================
+
+def _semester_credits(sem):
+
+    # "4" and 4.0 count like 4; anything unreadable counts as 0
+    return sum(
+        _as_int(c.get("credits")) or 0 for c in sem.get("courses", [])
+        if isinstance(c, dict)
+    )
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_patch(roadmap, operations):
+
+    updated = copy.deepcopy(roadmap)
+    semesters = {s["semester_number"]: s for s in updated.get("semesters", [])}
+    errors = []
+    touched = set()
+
+    # resolve ids and names against the roadmap the model was shown, so
+    # earlier operations do not shift the indices of later ones
+    by_id = {}
+    by_name = {}
+    for number, sem in semesters.items():
+        for i, c in enumerate(sem.get("courses", [])):
+            by_id[course_id(number, i)] = (number, c)
+            by_name[c.get("name", "").strip().lower()] = (number, c)
+
+    removed = []
+
+    def locate(op):
+        ref = str(op.get("id") or op.get("course") or "").strip()
+        found = by_id.get(ref) or by_name.get(ref.lower())
+        if found and any(found[1] is c for c in removed):
+            return None
+        return found
+
+    def detach(number, course):
+        sem = semesters[number]
+        sem["courses"] = [c for c in sem["courses"] if c is not course]
+        touched.add(number)
+
+    for op in operations or []:
+
+        kind = op.get("op") if isinstance(op, dict) else None
+
+        if kind == "add":
+            course = op.get("course") or {}
+            number = _as_int(op.get("semester"))
+
+            if not isinstance(course, dict):
+                errors.append(f"add: course must be an object, got {course!r}")
+                continue
+
+            name = str(course.get("name", "")).strip()
+
+            if not name:
+                errors.append("add: missing course name")
+            elif number not in semesters:
+                errors.append(f"add {name}: unknown semester {number}")
+            elif name.lower() in by_name:
+                errors.append(f"add {name}: course already exists")
+            else:
+                course.setdefault("difficulty", "Medium")
+                course.setdefault("credits", 3)
+                course.setdefault("prerequisites", [])
+                semesters[number].setdefault("courses", []).append(course)
+                by_name[name.lower()] = (number, course)
+                touched.add(number)
+
+        elif kind == "move":
+            found = locate(op)
+            number = _as_int(op.get("semester"))
+
+            if not found:
+                errors.append(f"move: course {op.get('id') or op.get('course')} not found")
+            elif number not in semesters:
+                errors.append(f"move: unknown semester {number}")
+            else:
+                source, course = found
+                detach(source, course)
+                semesters[number].setdefault("courses", []).append(course)
+                by_name[course.get("name", "").strip().lower()] = (number, course)
+                for key, value in by_id.items():
+                    if value[1] is course:
+                        by_id[key] = (number, course)
+                touched.add(number)
+
+        elif kind == "remove":
+            found = locate(op)
+
+            if not found:
+                errors.append(f"remove: course {op.get('id') or op.get('course')} not found")
+            else:
+                source, course = found
+                detach(source, course)
+                removed.append(course)
+                by_name.pop(course.get("name", "").strip().lower(), None)
+
+        else:
+            errors.append(f"unsupported operation: {op}")
+
+    for number in touched:
+        semesters[number]["total_credits"] = _semester_credits(semesters[number])
+
+    return updated, errors
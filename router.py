@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+
+from ollama_client import OllamaError
+from telemetry import get_registry
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Which local model, and with which options, each call type runs on.
+# Roadmap work (outline, semesters, single-prompt roadmap) can go to a
+# larger model; interactive calls (chat, sessions, capability) carry a
+# latency budget. When the preferred model's recent p95 for that call
+# type is over budget the call goes to the route's smaller fallback, until
+# the slow samples age out of the window. The p95 leaves out model load
+# time and, for streamed calls, counts only the wait for the first token;
+# it needs MIN_SAMPLES calls so a few slow ones cannot flip the route. A
+# failed request (missing model, HTTP error) is retried once on the
+# fallback as well.
+#
+# Models come from OLLAMA_MODEL / OLLAMA_LARGE_MODEL / OLLAMA_SMALL_MODEL;
+# OLLAMA_ROUTES may point at a JSON file of per-call-type overrides, e.g.
+# {"chat": {"budget_ms": 3000}, "roadmap": {"model": "granite3.3:8b"}}.
+
+DEFAULT_MODEL = os.environ.get("OLLAMA_MODEL", "granite3.3:2b")
+LARGE_MODEL = os.environ.get("OLLAMA_LARGE_MODEL", DEFAULT_MODEL)
+SMALL_MODEL = os.environ.get("OLLAMA_SMALL_MODEL", DEFAULT_MODEL)
+ROUTES_PATH = os.environ.get("OLLAMA_ROUTES")
+
+BUDGET_WINDOW = 300
+MIN_SAMPLES = 20
+
+# keys of a route that are sent to Ollama as "options"
+PROFILE_KEYS = ["temperature", "num_predict", "num_ctx"]
+
+ROUTES = {
+    "default": {
+        "model": DEFAULT_MODEL, "fallback": SMALL_MODEL,
+        "temperature": 0.2, "num_predict": 1024, "num_ctx": 4096
+    },
+    "capability": {
+        "model": DEFAULT_MODEL, "fallback": SMALL_MODEL, "budget_ms": 8000,
+        "temperature": 0.2, "num_predict": 256, "num_ctx": 2048
+    },
+    "outline": {
+        "model": LARGE_MODEL, "fallback": DEFAULT_MODEL,
+        "temperature": 0.2, "num_predict": 512, "num_ctx": 2048
+    },
+    "semester": {
+        "model": LARGE_MODEL, "fallback": DEFAULT_MODEL,
+        "temperature": 0.2, "num_predict": 1024, "num_ctx": 4096
+    },
+    "roadmap": {
+        "model": LARGE_MODEL, "fallback": DEFAULT_MODEL,
+        "temperature": 0.2, "num_predict": 4096, "num_ctx": 8192
+    },
+    "modify": {
+        "model": DEFAULT_MODEL, "fallback": SMALL_MODEL,
+        "temperature": 0.2, "num_predict": 768, "num_ctx": 8192
+    },
+    "sessions": {
+        "model": DEFAULT_MODEL, "fallback": SMALL_MODEL, "budget_ms": 10000,
+        "temperature": 0.2, "num_predict": 1024, "num_ctx": 2048
+    },
+    "chat": {
+        "model": DEFAULT_MODEL, "fallback": SMALL_MODEL, "budget_ms": 6000,
+        "temperature": 0.7, "num_predict": 512, "num_ctx": 4096
+    }
+}
+
+
+def load_routes(path=ROUTES_PATH):
+    routes = {name: dict(route) for name, route in ROUTES.items()}
+
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for name, override in json.load(f).items():
+                routes.setdefault(name, dict(routes["default"])).update(override)
+
+    return routes
+
+
+# =====================================================
+# ROUTER
+# =====================================================
+
+class ModelRouter:
+
+    def __init__(self, routes=None, registry=None, window=BUDGET_WINDOW, min_samples=MIN_SAMPLES):
+        self.routes = routes or load_routes()
+        self.registry = registry or get_registry()
+        self.window = window
+        self.min_samples = min_samples
+
+    def _route(self, call_type):
+        name = call_type[:-len("_continue")] if call_type.endswith("_continue") else call_type
+        return self.routes.get(name, self.routes["default"])
+
+    def fallback(self, call_type, model):
+        fallback = self._route(call_type).get("fallback")
+        return fallback if fallback and fallback != model else None
+
+    def over_budget(self, call_type, model):
+        budget = self._route(call_type).get("budget_ms")
+        if not budget:
+            return False
+        p95 = self.registry.model_p95(call_type, model, self.window, self.min_samples)
+        return p95 is not None and p95 > budget
+
+    def route(self, call_type):
+
+        # (model, options) for one call; options is a fresh dict
+        route = self._route(call_type)
+        model = route["model"]
+
+        if self.fallback(call_type, model) and self.over_budget(call_type, model):
+            model = route["fallback"]
+
+        return model, {key: route[key] for key in PROFILE_KEYS if key in route}
+
+    def models(self):
+
+        # every model a call can land on: the preferred models in route
+        # order, then the fallbacks
+        preferred = [route["model"] for route in self.routes.values()]
+        fallbacks = [route["fallback"] for route in self.routes.values() if route.get("fallback")]
+        return list(dict.fromkeys(preferred + fallbacks))
+
+    def table(self):
+        rows = []
+        for name, route in self.routes.items():
+            model, _ = self.route(name)
+            p95 = self.registry.model_p95(name, route["model"], self.window, self.min_samples)
+            rows.append(dict(
+                call_type=name,
+                model=route["model"],
+                fallback=route.get("fallback"),
+                budget_ms=route.get("budget_ms"),
+                p95_ms=p95,
+                active=model
+            ))
+        return rows
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter()
+    return _router
+
+
+# =====================================================
+# CALLS WITH FALLBACK
+# =====================================================
+
+def post_with_fallback(client, payload, call_type):
+
+    # one retry on the route's fallback model when the preferred one
+    # errors or answers with a non-200 status; returns (response, model
+    # that answered) so callers cache under the right model
+    model = payload.get("model")
+    fallback = get_router().fallback(call_type, model)
+
+    try:
+        response = client.post(payload, call_type)
+    except OllamaError:
+        if not fallback:
+            raise
+    else:
+        if response.status_code == 200 or not fallback:
+            return response, model
+        response.close()
+
+    return client.post(dict(payload, model=fallback), call_type), fallback
+
+
+def stream_with_fallback(client, payload, call_type):
+
+    # yields (model, chunk); falls back only if nothing has been streamed
+    # yet
+    model = payload.get("model")
+    fallback = get_router().fallback(call_type, model)
+    started = False
+
+    try:
+        for chunk in client.stream(payload, call_type):
+            started = True
+            yield model, chunk
+        return
+    except OllamaError:
+        if started or not fallback:
+            raise
+
+    for chunk in client.stream(dict(payload, model=fallback), call_type):
+        yield fallback, chunk
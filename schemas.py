@@ -0,0 +1,299 @@
+import copy
+import re
+
+# =====================================================
+# RESPONSE SCHEMAS
+# =====================================================
+#
+# One JSON schema per call type. The schema is sent as Ollama's "format"
+# (constrained decoding, so the model cannot emit anything else) and the
+# same schema, compiled once into plain functions, checks and coerces the
+# parsed reply: "4" or "4 credits" become 4, "medium" becomes "Medium", a
+# comma separated prerequisite string becomes a list, a semester without
+# total_credits gets the sum of its courses. Call types without a schema
+# fall back to format "json" and are returned as parsed.
+
+COURSE = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "difficulty": {"type": "string", "enum": ["Easy", "Medium", "Hard"]},
+        "credits": {"type": "integer"},
+        "prerequisites": {"type": "array", "items": {"type": "string"}, "default": []}
+    },
+    "required": ["name", "difficulty", "credits"]
+}
+
+SEMESTER = {
+    "type": "object",
+    "properties": {
+        "semester_number": {"type": "integer"},
+        "total_credits": {"type": "integer"},
+        "summary": {"type": "string", "default": ""},
+        "courses": {"type": "array", "items": COURSE}
+    },
+    "required": ["semester_number", "courses"]
+}
+
+SCHEMAS = {
+    "capability": {
+        "type": "object",
+        "properties": {
+            "predicted_level": {"type": "string"},
+            "reason": {"type": "string", "default": ""}
+        },
+        "required": ["predicted_level"]
+    },
+    "outline": {
+        "type": "object",
+        "properties": {
+            "semesters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "semester_number": {"type": "integer"},
+                        "theme": {"type": "string"}
+                    },
+                    "required": ["semester_number", "theme"]
+                }
+            }
+        },
+        "required": ["semesters"]
+    },
+    "semester": SEMESTER,
+    "roadmap": {
+        "type": "object",
+        "properties": {
+            "semesters": {"type": "array", "items": SEMESTER}
+        },
+        "required": ["semesters"]
+    },
+    "sessions": {
+        "type": "object",
+        "properties": {
+            "sessions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "session_number": {"type": "integer"},
+                        "topic": {"type": "string"},
+                        "description": {"type": "string", "default": ""}
+                    },
+                    "required": ["session_number", "topic"]
+                }
+            }
+        },
+        "required": ["sessions"]
+    },
+    "modify": {
+        "type": "object",
+        "properties": {
+            "operations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "op": {"type": "string", "enum": ["add", "move", "remove"]},
+                        "id": {"type": "string"},
+                        "semester": {"type": "integer"},
+                        "course": COURSE
+                    },
+                    "required": ["op"]
+                }
+            },
+            "reason": {"type": "string", "default": ""}
+        },
+        "required": ["operations"]
+    }
+}
+
+
+class SchemaError(ValueError):
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors[:5]))
+        self.errors = errors
+
+
+# =====================================================
+# COMPILED VALIDATORS
+# =====================================================
+#
+# compile_schema turns a schema into a function check(value, path, errors)
+# that returns the coerced value and appends "path: problem" strings.
+
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+MISSING = object()
+
+
+def _course_credits(obj):
+    return sum(
+        c["credits"] for c in obj.get("courses") or []
+        if isinstance(c, dict) and isinstance(c.get("credits"), (int, float))
+    )
+
+
+# fields left out of a reply that are worked out from the rest of the
+# object instead of being defaulted
+DERIVED = {
+    "total_credits": _course_credits
+}
+
+
+def _as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = NUMBER.search(value)
+        if match:
+            return float(match.group())
+    return None
+
+
+def _integer(value, path, errors):
+    number = _as_number(value)
+    if number is None:
+        errors.append(f"{path}: expected integer")
+        return value
+    return int(round(number))
+
+
+def _number(value, path, errors):
+    number = _as_number(value)
+    if number is None:
+        errors.append(f"{path}: expected number")
+        return value
+    return number
+
+
+def _string(value, path, errors):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    errors.append(f"{path}: expected string")
+    return value
+
+
+def _boolean(value, path, errors):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    errors.append(f"{path}: expected boolean")
+    return value
+
+
+SCALARS = {
+    "integer": _integer,
+    "number": _number,
+    "string": _string,
+    "boolean": _boolean
+}
+
+
+def _enum(check, allowed):
+    lookup = {str(a).lower(): a for a in allowed}
+
+    def run(value, path, errors):
+        value = check(value, path, errors)
+        key = str(value).lower()
+        if key in lookup:
+            return lookup[key]
+        errors.append(f"{path}: expected one of {', '.join(map(str, allowed))}")
+        return value
+
+    return run
+
+
+def _array(items):
+
+    def run(value, path, errors):
+        if isinstance(value, str):
+            # "A, B" for a list of names
+            value = [v for v in (p.strip() for p in value.split(",")) if v]
+        elif value is None:
+            value = []
+        elif not isinstance(value, list):
+            errors.append(f"{path}: expected array")
+            return value
+        return [items(v, f"{path}[{i}]", errors) for i, v in enumerate(value)]
+
+    return run
+
+
+def _object(properties, required):
+    checks = {name: compile_schema(prop) for name, prop in properties.items()}
+    defaults = {name: prop["default"] for name, prop in properties.items() if "default" in prop}
+
+    def run(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{path}: expected object")
+            return value
+
+        result = dict(value)
+        for name, check in checks.items():
+            item = value.get(name, MISSING)
+
+            if item is MISSING or item is None:
+                if name in defaults:
+                    result[name] = copy.deepcopy(defaults[name])
+                elif name in required:
+                    errors.append(f"{path}.{name}: missing")
+                continue
+
+            result[name] = check(item, f"{path}.{name}", errors)
+
+        # after the loop, so derived fields see the coerced values
+        for name in checks:
+            if name in DERIVED and result.get(name) is None:
+                result[name] = DERIVED[name](result)
+
+        return result
+
+    return run
+
+
+def compile_schema(schema):
+    kind = schema.get("type")
+
+    if kind == "object":
+        check = _object(schema.get("properties", {}), set(schema.get("required", [])))
+    elif kind == "array":
+        check = _array(compile_schema(schema.get("items", {})))
+    elif kind in SCALARS:
+        check = SCALARS[kind]
+    else:
+        return lambda value, path, errors: value
+
+    if "enum" in schema:
+        check = _enum(check, schema["enum"])
+
+    return check
+
+
+VALIDATORS = {call_type: compile_schema(schema) for call_type, schema in SCHEMAS.items()}
+
+
+def response_format(call_type):
+    return SCHEMAS.get(call_type, "json")
+
+
+def validate(call_type, data):
+
+    # coerced copy of data; raises SchemaError listing every problem
+    check = VALIDATORS.get(call_type)
+    if check is None:
+        return data
+
+    errors = []
+    result = check(data, call_type, errors)
+
+    if errors:
+        raise SchemaError(errors)
+
+    return result
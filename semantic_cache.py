@@ -0,0 +1,264 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dedupe import ngram_matrix, normalize_name, qualifiers
+from shared_cache import canonical_inputs, canonical_text, get_shared_cache, make_key
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Nearest-neighbour fallback for the shared generation cache. Exact keys
+# miss on near-identical programs ("Data Science / ML" vs "Data Science /
+# Machine Learning"), so the free-text inputs are also embedded as hashed
+# character trigram vectors and compared against every earlier request with
+# the same kind and exact fields. Each text field is its own vector and
+# every one of them must clear the threshold. Plurals and British spellings
+# are folded first ("Data Sciences" is "Data Science"); the threshold sits
+# just above the closest distinct names measured ("Organic Chemistry" vs
+# "Inorganic Chemistry" scores 0.89).
+#
+# Inputs that change the answer outright must match exactly: degree, level,
+# duration, weekly hours, the focus ("Machine Learning Ops" is not
+# "Machine Learning"), and the level numbers and Lab / Project style tags
+# of every text ("Organic Chemistry II" is not "Organic Chemistry I").
+
+SEMANTIC_ENABLED = os.environ.get("SEMANTIC_CACHE", "1") != "0"
+SEMANTIC_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", 0.9))
+SEMANTIC_DIMS = 256
+SEMANTIC_MAX_ENTRIES = 100_000
+
+TEXT_FIELDS = ["domain"]
+
+BRITISH_OUR = re.compile(r"^([a-z]{3,})our")
+
+
+def fold(text):
+
+    # drop spelling differences that never change the answer: a trailing
+    # plural "s" and British "-our" (behaviour, behavioural, colour)
+    words = []
+    for word in text.split():
+        word = BRITISH_OUR.sub(r"\1or", word)
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def describe(kind, data, fields=None):
+
+    # (exact-match group, tuple of texts) for one request; a plain string
+    # (course name) is a single text
+    if fields is None:
+        exact = {}
+        texts = (normalize_name(data),)
+    else:
+        canon = canonical_inputs(data, fields)
+        exact = {f: v for f, v in canon.items() if f not in TEXT_FIELDS}
+        texts = tuple(normalize_name(canon[f]) for f in fields if f in TEXT_FIELDS)
+
+    exact["_qualifiers"] = [sorted(qualifiers(t)) for t in texts]
+
+    return kind + ":" + json.dumps(exact, sort_keys=True), tuple(fold(t) for t in texts)
+
+
+# =====================================================
+# VECTOR INDEX
+# =====================================================
+
+class SemanticIndex:
+
+    def __init__(self, dims=SEMANTIC_DIMS, max_entries=SEMANTIC_MAX_ENTRIES, threshold=SEMANTIC_THRESHOLD):
+        self.dims = dims
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.hits = 0
+
+        # one vector block per exact-match group, so a query only scores
+        # rows it could actually reuse. Blocks are stored dims-major (one
+        # column per entry, the per-field vectors stacked), so a query reads
+        # only the handful of dims its trigrams hit instead of the whole
+        # block. _rows keeps insertion order for eviction
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self._rows = OrderedDict()
+
+    def _embed(self, texts):
+        return np.hstack([ngram_matrix([t], dims=self.dims) for t in texts])[0]
+
+    def _block(self, group, width):
+        block = self._blocks.get(group)
+        if block is None:
+            block = self._blocks[group] = {
+                "vectors": np.zeros((width, 64), dtype=np.float32),
+                "keys": []
+            }
+        return block
+
+    def _remove(self, key):
+        group, row = self._rows.pop(key)
+        block = self._blocks[group]
+        last = len(block["keys"]) - 1
+
+        # swap the last row into the hole to keep the block contiguous
+        if row != last:
+            moved = block["keys"][last]
+            block["vectors"][:, row] = block["vectors"][:, last]
+            block["keys"][row] = moved
+            self._rows[moved] = (group, row)
+
+        block["keys"].pop()
+        if not block["keys"]:
+            del self._blocks[group]
+
+    def add(self, group, texts, key):
+        vector = self._embed(texts)
+
+        with self._lock:
+            if key in self._rows:
+                self._remove(key)
+
+            block = self._block(group, len(vector))
+            row = len(block["keys"])
+
+            if row == block["vectors"].shape[1]:
+                grown = np.zeros((len(vector), row * 2), dtype=np.float32)
+                grown[:, :row] = block["vectors"]
+                block["vectors"] = grown
+
+            block["vectors"][:, row] = vector
+            block["keys"].append(key)
+            self._rows[key] = (group, row)
+
+            while len(self._rows) > self.max_entries:
+                self._remove(next(iter(self._rows)))
+
+    def _scores(self, queries, vectors):
+
+        # a row's score is its weakest field; dims no query touches add
+        # nothing to the dot product, so only the touched ones are read
+        scores = None
+        for start in range(0, queries.shape[1], self.dims):
+            field = queries[:, start:start + self.dims]
+            dims = np.nonzero(field.any(axis=0))[0]
+            field = field[:, dims] @ vectors[start + dims]
+            scores = field if scores is None else np.minimum(scores, field)
+        return scores
+
+    def search(self, groups, texts, alive=None):
+
+        # one (key, score) or None per query (texts is one tuple per query);
+        # queries of the same group are scored against that group's block
+        # in one matrix product per field. Rows that alive(key) rejects are
+        # dropped before a best match is chosen
+        found = [None] * len(texts)
+        dead = set()
+
+        batches = {}
+        for q, group in enumerate(groups):
+            batches.setdefault(group, []).append(q)
+
+        with self._lock:
+            for group, qs in batches.items():
+                block = self._blocks.get(group)
+                if block is None:
+                    continue
+
+                queries = np.vstack([self._embed(texts[q]) for q in qs])
+                keys = list(block["keys"])
+                scores = self._scores(queries, block["vectors"][:, :len(keys)])
+
+                for i, q in enumerate(qs):
+                    rows = np.nonzero(scores[i] >= self.threshold)[0]
+                    for row in rows[np.argsort(-scores[i, rows], kind="stable")]:
+                        score = float(scores[i, row])
+                        key = keys[row]
+                        if key in dead:
+                            continue
+                        if alive is None or alive(key):
+                            found[q] = (key, score)
+                            break
+                        dead.add(key)
+
+            for key in dead:
+                self._remove(key)
+
+            self.hits += sum(f is not None for f in found)
+
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._rows.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._rows), "groups": len(self._blocks), "hits": self.hits}
+
+
+# =====================================================
+# PROCESS-WIDE INSTANCE
+# =====================================================
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_semantic_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SemanticIndex()
+    return _index
+
+
+def exact_key(kind, data, fields=None):
+    if fields is None:
+        return make_key(kind, canonical_text(data))
+    return make_key(kind, canonical_inputs(data, fields))
+
+
+def find_result(kind, data, fields=None):
+
+    # exact shared-cache hit first, then the nearest earlier request
+    cache = get_shared_cache()
+    value = cache.get(exact_key(kind, data, fields))
+
+    if value is not None or not SEMANTIC_ENABLED:
+        return value
+
+    group, texts = describe(kind, data, fields)
+    found = get_semantic_index().search([group], [texts], alive=cache.alive)[0]
+
+    return cache.get(found[0]) if found else None
+
+
+def publish_result(kind, data, value, fields=None):
+    key = exact_key(kind, data, fields)
+    get_shared_cache().put(key, value)
+
+    if SEMANTIC_ENABLED:
+        group, texts = describe(kind, data, fields)
+        get_semantic_index().add(group, texts, key)
+
+
+def cached_result(kind, data, compute, fields=None):
+    value = find_result(kind, data, fields)
+    if value is not None:
+        return value
+
+    key = exact_key(kind, data, fields)
+    value = get_shared_cache().get_or_compute(key, compute)
+
+    if SEMANTIC_ENABLED:
+        group, texts = describe(kind, data, fields)
+        get_semantic_index().add(group, texts, key)
+
+    return value
@@ -0,0 +1,185 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Process-wide cache of finished generation results (capability, roadmap,
+# sessions) shared by every session on the server. Keys are built from
+# canonicalised planner inputs, so "B.Tech / CS / AI" and "btech / computer
+# science / artificial intelligence" hit the same entry. Concurrent misses
+# on one key are collapsed: the first caller computes, the rest wait.
+
+SHARED_CACHE_ENABLED = os.environ.get("SHARED_CACHE", "1") != "0"
+SHARED_TTL = float(os.environ.get("SHARED_CACHE_TTL", 6 * 3600))
+SHARED_MAX_ENTRIES = 2000
+
+SYNONYMS = {
+    "cs": "computer science",
+    "cse": "computer science",
+    "comp sci": "computer science",
+    "computer science and engineering": "computer science",
+    "computer science engineering": "computer science",
+    "it": "information technology",
+    "ai": "artificial intelligence",
+    "a i": "artificial intelligence",
+    "ml": "machine learning",
+    "ai ml": "artificial intelligence and machine learning",
+    "ai and ml": "artificial intelligence and machine learning",
+    "ds": "data science",
+    "ece": "electronics and communication",
+    "eee": "electrical and electronics",
+    "mech": "mechanical engineering",
+    "cyber security": "cybersecurity",
+    "btech": "b.tech",
+    "b tech": "b.tech",
+    "bachelor of technology": "b.tech",
+    "msc": "msc",
+    "m sc": "msc",
+    "bsc": "bsc",
+    "b sc": "bsc",
+    "mba": "mba"
+}
+
+ROADMAP_FIELDS = ["degree", "domain", "focus", "level", "duration"]
+CAPABILITY_FIELDS = ROADMAP_FIELDS + ["weekly"]
+
+
+def canonical_text(value):
+    text = re.sub(r"[^a-z0-9+#]+", " ", str(value).lower()).strip()
+    text = re.sub(r"\s+", " ", text)
+    return SYNONYMS.get(text, text)
+
+
+def canonical_inputs(data, fields=ROADMAP_FIELDS):
+    canon = {}
+
+    for field in fields:
+        value = data.get(field)
+        if isinstance(value, (int, float)):
+            canon[field] = int(value)
+        else:
+            canon[field] = canonical_text(value or "")
+
+    return canon
+
+
+def make_key(kind, value):
+    return kind + ":" + json.dumps(value, sort_keys=True)
+
+
+# =====================================================
+# SHARED TTL CACHE
+# =====================================================
+
+class SharedCache:
+
+    def __init__(self, ttl=SHARED_TTL, max_entries=SHARED_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._pending = {}
+
+    def get(self, key):
+        if not SHARED_CACHE_ENABLED:
+            return None
+
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or now - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+
+        # callers may edit what they get back; the cached copy stays intact
+        return copy.deepcopy(value)
+
+    def alive(self, key):
+
+        # whether get(key) would hit, without counting or copying
+        if not SHARED_CACHE_ENABLED:
+            return False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() - entry[0] <= self.ttl
+
+    def put(self, key, value):
+        if not SHARED_CACHE_ENABLED:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        if not SHARED_CACHE_ENABLED:
+            return compute()
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            waiter = self._pending.get(key)
+            if waiter is None:
+                self._pending[key] = threading.Event()
+
+        if waiter is not None:
+            waiter.wait()
+            value = self.get(key)
+            if value is not None:
+                return value
+            # the first caller failed; compute it ourselves
+            return compute()
+
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# =====================================================
+# PROCESS-WIDE INSTANCE
+# =====================================================
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedCache()
+    return _shared
@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Every LLM call (and every cache hit) becomes one event: call type,
+# model, cache status, wall time and Ollama's own counters (prompt tokens,
+# output tokens, load / prompt / decode durations). Events are appended to
+# a JSONL file and folded into an in-process registry for live summaries.
+
+TELEMETRY_PATH = os.environ.get(
+    "AI_TELEMETRY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ai_telemetry.jsonl")
+)
+TELEMETRY_ENABLED = os.environ.get("AI_TELEMETRY", "1") != "0"
+
+MAX_LOG_BYTES = 50 * 1024 * 1024
+RECENT = 500
+
+# Ollama reports durations in nanoseconds
+DURATIONS = ["total_duration", "load_duration", "prompt_eval_duration", "eval_duration"]
+COUNTS = ["prompt_eval_count", "eval_count"]
+
+
+# =====================================================
+# EVENTS
+# =====================================================
+
+def make_event(call_type, model, wall, cache="miss", result=None, error=None, first_token=None):
+
+    result = result or {}
+    event = {
+        "ts": round(time.time(), 3),
+        "app": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "",
+        "call_type": call_type,
+        "model": model,
+        "cache": cache,
+        "wall_ms": round(wall * 1000, 2)
+    }
+
+    for key in COUNTS:
+        if isinstance(result.get(key), int):
+            event[key] = result[key]
+
+    for key in DURATIONS:
+        if isinstance(result.get(key), (int, float)):
+            event[key.replace("_duration", "_ms")] = round(result[key] / 1e6, 2)
+
+    if event.get("eval_count") and event.get("eval_ms"):
+        event["tokens_per_sec"] = round(event["eval_count"] / (event["eval_ms"] / 1000), 2)
+
+    if first_token is not None:
+        event["first_token_ms"] = round(first_token * 1000, 2)
+
+    if error is not None:
+        event["error"] = str(error)[:300]
+
+    return event
+
+
+# =====================================================
+# METRICS REGISTRY
+# =====================================================
+
+class MetricsRegistry:
+
+    def __init__(self, recent=RECENT):
+        self.recent = recent
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._reruns = deque(maxlen=recent)
+
+        # (call_type, model) -> recent (ts, ms) of answered, uncached calls;
+        # the model router reads these. ms is what the user waits for once
+        # the model is loaded: time to first token for streamed calls, wall
+        # time otherwise, both less Ollama's load_duration
+        self._model_wall = {}
+
+    def _entry(self, call_type):
+        s = self._stats.get(call_type)
+        if s is None:
+            s = self._stats[call_type] = {
+                "calls": 0,
+                "errors": 0,
+                "cache_hits": 0,
+                "parse_errors": 0,
+                "repairs": 0,
+                "wall_ms": 0.0,
+                "prompt_eval_count": 0,
+                "eval_count": 0,
+                "load_ms": 0.0,
+                "prompt_eval_ms": 0.0,
+                "eval_ms": 0.0,
+                "recent_wall_ms": deque(maxlen=self.recent)
+            }
+        return s
+
+    def observe(self, event):
+        with self._lock:
+            s = self._entry(event["call_type"])
+
+            s["calls"] += 1
+            s["errors"] += "error" in event
+            s["cache_hits"] += event["cache"] == "hit"
+            s["wall_ms"] += event["wall_ms"]
+            s["recent_wall_ms"].append(event["wall_ms"])
+
+            for key in ("prompt_eval_count", "eval_count", "load_ms", "prompt_eval_ms", "eval_ms"):
+                s[key] += event.get(key, 0)
+
+            if event["cache"] != "hit" and "error" not in event:
+                key = (event["call_type"], event["model"])
+                if key not in self._model_wall:
+                    self._model_wall[key] = deque(maxlen=self.recent)
+                ms = event.get("first_token_ms", event["wall_ms"]) - event.get("load_ms", 0)
+                self._model_wall[key].append((event["ts"], max(0.0, ms)))
+
+    def parse_error(self, call_type):
+        with self._lock:
+            self._entry(call_type)["parse_errors"] += 1
+
+    def repaired(self, call_type):
+        with self._lock:
+            self._entry(call_type)["repairs"] += 1
+
+    def record_rerun(self, page, seconds):
+        with self._lock:
+            self._reruns.append((time.time(), page, round(seconds * 1000, 2)))
+
+    def latencies(self):
+        with self._lock:
+            return {t: list(s["recent_wall_ms"]) for t, s in self._stats.items()}
+
+    def model_p95(self, call_type, model, window, min_samples=1):
+
+        # p95 latency of one model on one call type over the last
+        # `window` seconds; None until there are enough samples
+        cutoff = time.time() - window
+        with self._lock:
+            samples = sorted(
+                ms for ts, ms in self._model_wall.get((call_type, model), ())
+                if ts >= cutoff
+            )
+        if len(samples) < min_samples:
+            return None
+        return _percentile(samples, 95)
+
+    def reruns(self):
+        with self._lock:
+            return list(self._reruns)
+
+    def snapshot(self):
+
+        # one summary dict per call type; percentiles over recent calls
+        with self._lock:
+            summary = {}
+
+            for call_type, s in self._stats.items():
+                recent = sorted(s["recent_wall_ms"])
+                summary[call_type] = {
+                    "calls": s["calls"],
+                    "errors": s["errors"],
+                    "cache_hits": s["cache_hits"],
+                    "cache_hit_rate": round(s["cache_hits"] / s["calls"], 3) if s["calls"] else None,
+                    "parse_errors": s["parse_errors"],
+                    "repairs": s["repairs"],
+                    "avg_wall_ms": round(s["wall_ms"] / s["calls"], 2) if s["calls"] else None,
+                    "p50_wall_ms": _percentile(recent, 50),
+                    "p95_wall_ms": _percentile(recent, 95),
+                    "prompt_tokens": s["prompt_eval_count"],
+                    "output_tokens": s["eval_count"],
+                    "load_ms": round(s["load_ms"], 2),
+                    "prompt_eval_ms": round(s["prompt_eval_ms"], 2),
+                    "eval_ms": round(s["eval_ms"], 2),
+                    "tokens_per_sec": (
+                        round(s["eval_count"] / (s["eval_ms"] / 1000), 2)
+                        if s["eval_ms"] else None
+                    )
+                }
+
+            return summary
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._reruns.clear()
+            self._model_wall.clear()
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+# =====================================================
+# JSONL LOG
+# =====================================================
+
+class TelemetryLog:
+
+    def __init__(self, path=TELEMETRY_PATH, max_bytes=MAX_LOG_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def write(self, event):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            try:
+                # keep one rotated file next to the live one
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+
+_registry = MetricsRegistry()
+_log = TelemetryLog()
+
+
+def get_registry():
+    return _registry
+
+
+def record(call_type, model, wall, cache="miss", result=None, error=None, first_token=None):
+
+    event = make_event(call_type, model, wall, cache, result, error, first_token)
+    _registry.observe(event)
+
+    if TELEMETRY_ENABLED:
+        _log.write(event)
+
+    return event
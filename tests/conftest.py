@@ -0,0 +1,66 @@
+import os
+import sys
+
+# the modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ollama_client import OllamaError  # noqa: E402
+
+
+# =====================================================
+# SHARED HELPERS
+# =====================================================
+#
+# Plain helpers rather than fixtures; test modules import them with
+# "from conftest import ...".
+
+def roadmap(*semesters):
+
+    # a course-style roadmap, one list of courses per semester
+    return {
+        "semesters": [
+            {"semester_number": i + 1, "courses": courses}
+            for i, courses in enumerate(semesters)
+        ]
+    }
+
+
+class Reply:
+
+    # a non-streamed /api/generate response
+    def __init__(self, response="", done_reason="stop", status_code=200):
+        self.status_code = status_code
+        self.text = response
+        self.body = {"response": response, "done": True, "done_reason": done_reason}
+
+    def json(self):
+        return self.body
+
+    def close(self):
+        pass
+
+
+class FakeClient:
+
+    # replays replies (post) and chunks (stream) in order; models in fail
+    # raise OllamaError the way a missing model does
+    def __init__(self, replies=(), stream=(), fail=()):
+        self.replies = list(replies)
+        self.chunks = list(stream)
+        self.fail = set(fail)
+        self.prompts = []
+        self.models = []
+
+    def _call(self, payload):
+        self.models.append(payload.get("model"))
+        self.prompts.append(payload.get("prompt"))
+        if payload.get("model") in self.fail:
+            raise OllamaError("model not found")
+
+    def post(self, payload, call_type="default"):
+        self._call(payload)
+        return self.replies.pop(0) if self.replies else Reply()
+
+    def stream(self, payload, call_type="default"):
+        self._call(payload)
+        yield from self.chunks
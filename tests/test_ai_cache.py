@@ -0,0 +1,63 @@
+import pytest
+
+import ai_cache
+from ai_cache import ResponseCache, make_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ai_cache.time, "time", lambda: now[0])
+    return now
+
+
+def cache(tmp_path, **limits):
+    return ResponseCache(str(tmp_path / "cache.sqlite3"), **limits)
+
+
+def test_key_depends_on_model_prompt_and_options():
+    assert make_key("m", "p", {"a": 1}) == make_key("m", "p", {"a": 1})
+    assert make_key("m", "p") != make_key("n", "p")
+    assert make_key("m", "p", {"a": 1}) != make_key("m", "p", {"a": 2})
+
+
+def test_round_trip(tmp_path, clock):
+    c = cache(tmp_path)
+    c.put("m", "p", "reply", {"temperature": 0.2})
+    assert c.get("m", "p", {"temperature": 0.2}) == "reply"
+    assert c.get("m", "p", {"temperature": 0.7}) is None
+
+
+def test_least_recently_used_is_evicted_first(tmp_path, clock):
+    c = cache(tmp_path, max_entries=2)
+    c.put("m", "a", "1")
+    clock[0] += 1
+    c.put("m", "b", "2")
+    clock[0] += 1
+    assert c.get("m", "a") == "1"
+    clock[0] += 1
+    c.put("m", "c", "3")
+
+    assert c.get("m", "b") is None
+    assert c.get("m", "a") == "1"
+    assert c.stats()["entries"] == 2
+
+
+def test_byte_limit(tmp_path, clock):
+    c = cache(tmp_path, max_bytes=10)
+    for prompt in "abc":
+        clock[0] += 1
+        c.put("m", prompt, "x" * 4)
+
+    assert c.stats() == {"entries": 2, "bytes": 8}
+    assert c.get("m", "a") is None
+
+
+def test_expired_entries_are_dropped(tmp_path, clock):
+    c = cache(tmp_path, max_age=60)
+    c.put("m", "p", "old")
+    clock[0] += 61
+    assert c.get("m", "p") is None
+
+    c.put("m", "q", "new")
+    assert c.stats()["entries"] == 1
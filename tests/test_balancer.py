@@ -0,0 +1,85 @@
+from balancer import as_credits, balance_roadmap, plan_balance
+from conftest import roadmap
+
+
+def course(name, credits, prerequisites=()):
+    return {"name": name, "credits": credits, "prerequisites": list(prerequisites)}
+
+
+def loads(rm):
+    return [sum(as_credits(c["credits"]) for c in sem["courses"]) for sem in rm["semesters"]]
+
+
+def test_as_credits():
+    assert as_credits(4) == 4
+    assert as_credits("4") == 4
+    assert as_credits("3.5") == 3.5
+    assert as_credits("four") == 0
+    assert as_credits(None) == 0
+    assert as_credits(True) == 0
+    assert as_credits(-2) == 0
+
+
+def test_plan_balance_flattens_load():
+    semester = plan_balance([4, 4, 4, 4], [0, 0, 0, 0], [[], [], [], []], 2, 24)
+    assert sorted(semester) == [0, 0, 1, 1]
+
+
+def test_balance_moves_courses_and_updates_totals():
+    rm = roadmap([course(f"C{i}", 4) for i in range(6)], [])
+    updated, moves = balance_roadmap(rm, 24)
+
+    assert loads(updated) == [12, 12]
+    assert len(moves) == 3
+    assert [s["total_credits"] for s in updated["semesters"]] == [12, 12]
+    # the input roadmap is left alone
+    assert len(rm["semesters"][0]["courses"]) == 6
+
+
+def test_string_credits_are_balanced():
+    rm = roadmap([course(f"C{i}", "4") for i in range(4)], [])
+    updated, _ = balance_roadmap(rm, 24)
+    assert loads(updated) == [8, 8]
+
+
+def test_prerequisite_order_is_kept():
+    rm = roadmap(
+        [course("Intro", 6), course("Filler", 2)],
+        [course("Advanced", 6, ["Intro"]), course("Lab", 6)],
+        [course("Project", 6, ["Advanced"]), course("Capstone", 6), course("Thesis", 6)],
+        []
+    )
+    updated, _ = balance_roadmap(rm, 24)
+
+    where = {
+        c["name"]: sem["semester_number"]
+        for sem in updated["semesters"]
+        for c in sem["courses"]
+    }
+    assert where["Intro"] < where["Advanced"] < where["Project"]
+
+
+def test_max_credits_is_respected():
+    rm = roadmap([course("A", 10), course("B", 10), course("C", 10)], [course("D", 5)])
+    updated, _ = balance_roadmap(rm, 15)
+    assert loads(updated)[1] <= 15
+
+
+def test_already_balanced():
+    rm = roadmap([course("A", 4)], [course("B", 4)])
+    _, moves = balance_roadmap(rm, 24)
+    assert moves == []
+
+
+def test_category_fields():
+    rm = {
+        "semesters": [
+            {"semester_number": 1, "mandatory": [course("A", 4), course("B", 4)], "optional": [course("C", 4)]},
+            {"semester_number": 2, "mandatory": [], "optional": []}
+        ]
+    }
+    updated, moves = balance_roadmap(rm, 24, fields=["mandatory", "recommended", "optional"])
+    assert moves
+    assert "total_credits" not in updated["semesters"][0]
+    names = {c["name"] for sem in updated["semesters"] for c in sem.get("mandatory", [])}
+    assert names == {"A", "B"}
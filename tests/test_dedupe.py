@@ -0,0 +1,77 @@
+import pytest
+
+from dedupe import merge_duplicates, near_duplicates, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name("Intro to ML") == "introduction machine learning"
+    assert normalize_name("Calculus II") == "calculus 2"
+    assert normalize_name("Physics Laboratory") == "physics lab"
+
+
+def test_abbreviations_are_duplicates():
+    assert near_duplicates(["Intro to ML", "Introduction to Machine Learning"]) == [(0, 1, 1.0)]
+
+
+@pytest.mark.parametrize("lecture, tagged", [
+    ("Data Structures", "Data Structures Lab"),
+    ("Software Engineering", "Software Engineering Lab"),
+    ("Deep Learning", "Deep Learning Lab"),
+    ("Operating Systems", "Operating Systems Laboratory"),
+    ("Machine Learning", "Machine Learning Project"),
+    ("Research Methods", "Research Methods Seminar")
+])
+def test_session_type_tags_are_kept_apart(lecture, tagged):
+    assert near_duplicates([lecture, tagged]) == []
+
+
+def test_levels_are_kept_apart():
+    assert near_duplicates(["Calculus I", "Calculus II"]) == []
+    assert near_duplicates(["Physics 1", "Physics 2"]) == []
+
+
+def test_roman_and_numeric_levels_match():
+    assert near_duplicates(["Calculus II", "Calculus 2"]) == [(0, 1, 1.0)]
+
+
+def test_merge_rewrites_prerequisites_and_totals():
+    roadmap = {
+        "semesters": [
+            {
+                "semester_number": 1,
+                "total_credits": 7,
+                "courses": [
+                    {"name": "Intro to ML", "credits": 4, "prerequisites": []},
+                    {"name": "Statistics", "credits": 3, "prerequisites": []}
+                ]
+            },
+            {
+                "semester_number": 2,
+                "total_credits": 10,
+                "courses": [
+                    {"name": "Introduction to Machine Learning", "credits": 4, "prerequisites": ["Statistics"]},
+                    {"name": "Deep Learning", "credits": 3, "prerequisites": ["Introduction to Machine Learning"]},
+                    {"name": "Deep Learning Lab", "credits": "3", "prerequisites": [
+                        "introduction to machine learning", "Intro to ML", "Deep Learning"
+                    ]}
+                ]
+            }
+        ]
+    }
+
+    roadmap, merged = merge_duplicates(roadmap)
+
+    assert merged == [("Introduction to Machine Learning", "Intro to ML", 1.0)]
+    first, second = roadmap["semesters"]
+    assert first["courses"][0]["prerequisites"] == ["Statistics"]
+    assert [c["name"] for c in second["courses"]] == ["Deep Learning", "Deep Learning Lab"]
+    assert second["courses"][0]["prerequisites"] == ["Intro to ML"]
+    assert second["courses"][1]["prerequisites"] == ["Intro to ML", "Deep Learning"]
+    assert first["total_credits"] == 7
+    assert second["total_credits"] == 6
+
+
+def test_merge_without_duplicates_is_unchanged():
+    roadmap = {"semesters": [{"semester_number": 1, "total_credits": 99, "courses": [{"name": "Algebra"}]}]}
+    assert merge_duplicates(roadmap) == (roadmap, [])
+    assert roadmap["semesters"][0]["total_credits"] == 99
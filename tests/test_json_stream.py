@@ -0,0 +1,71 @@
+import json
+
+from json_stream import ArrayItemParser
+
+
+def roadmap(count):
+    return json.dumps({
+        "semesters": [
+            {"semester_number": n, "courses": [{"name": f"Course {n}", "credits": 4}]}
+            for n in range(1, count + 1)
+        ]
+    })
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(parser.feed(text[i:i + size]))
+    return items
+
+
+def test_items_arrive_as_each_closes():
+    text = roadmap(3)
+    parser = ArrayItemParser("semesters")
+
+    first = text.index("}]}") + 3
+    assert [s["semester_number"] for s in parser.feed(text[:first])] == [1]
+    assert [s["semester_number"] for s in parser.feed(text[first:])] == [2, 3]
+    assert parser.done
+
+
+def test_chunk_size_does_not_matter():
+    text = roadmap(4)
+    for size in (1, 3, 7, len(text)):
+        items = feed_in_chunks(ArrayItemParser("semesters"), text, size)
+        assert [s["semester_number"] for s in items] == [1, 2, 3, 4]
+
+
+def test_braces_inside_strings_are_ignored():
+    text = json.dumps({"semesters": [{"summary": "use {braces} and [brackets]", "n": 1}]})
+    assert ArrayItemParser("semesters").feed(text) == [{"summary": "use {braces} and [brackets]", "n": 1}]
+
+
+def test_escaped_quotes_inside_strings():
+    text = json.dumps({"semesters": [{"summary": 'say "hi" \\ bye'}]})
+    assert ArrayItemParser("semesters").feed(text)[0]["summary"] == 'say "hi" \\ bye'
+
+
+def test_nested_key_of_the_same_name_is_ignored():
+    text = json.dumps({
+        "meta": {"semesters": [{"semester_number": 99}]},
+        "semesters": [{"semester_number": 1}]
+    })
+    parser = ArrayItemParser("semesters")
+    assert parser.feed(text) == [{"semester_number": 1}]
+    assert parser.done
+
+
+def test_nested_key_alone_yields_nothing():
+    text = json.dumps({"meta": {"semesters": [{"semester_number": 1}]}})
+    parser = ArrayItemParser("semesters")
+    assert parser.feed(text) == []
+    assert not parser.done
+
+
+def test_truncated_item_is_not_returned():
+    text = roadmap(3)
+    cut = text[:text.rindex('{"semester_number"') + 25]
+    parser = ArrayItemParser("semesters")
+    assert [s["semester_number"] for s in parser.feed(cut)] == [1, 2]
+    assert not parser.done
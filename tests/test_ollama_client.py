@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ollama_client
+from ollama_client import OllamaClient, OllamaError
+
+
+class BrokenStream(BaseHTTPRequestHandler):
+
+    # sends one NDJSON line, then either stalls or sends garbage
+    mode = "stall"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.wfile.write(json.dumps({"response": "Hel", "done": False}).encode() + b"\n")
+        self.wfile.flush()
+
+        if self.mode == "stall":
+            time.sleep(2)
+        else:
+            self.wfile.write(b"{not json\n")
+            self.wfile.flush()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(ollama_client, "record", lambda *a, **k: recorded.append(k))
+    return recorded
+
+
+def serve(mode):
+    handler = type("Handler", (BrokenStream,), {"mode": mode})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/generate"
+
+
+@pytest.mark.parametrize("mode", ["stall", "garbage"])
+def test_broken_stream_raises_ollama_error(events, mode):
+    server, url = serve(mode)
+    client = OllamaClient(url, timeouts={"chat": (1, 0.3)}, max_retries=0)
+
+    chunks = []
+    try:
+        with pytest.raises(OllamaError):
+            for chunk in client.stream({"model": "m", "prompt": "hi"}, "chat"):
+                chunks.append(chunk)
+    finally:
+        server.shutdown()
+        client.close()
+
+    # whatever arrived before the break is still handed out
+    assert [c["response"] for c in chunks] in ([], ["Hel"])
+    assert "error" in events[-1]
+    assert client.in_flight == 0
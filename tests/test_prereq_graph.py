@@ -0,0 +1,36 @@
+from conftest import roadmap
+from prereq_graph import validate_roadmap
+
+
+def test_valid_roadmap_has_no_issues():
+    rm = roadmap(
+        [{"name": "Calculus I", "prerequisites": []}],
+        [{"name": "Calculus II", "prerequisites": ["Calculus I"]}]
+    )
+    assert validate_roadmap(rm) == []
+
+
+def test_missing_and_misplaced_prerequisites():
+    rm = roadmap(
+        [{"name": "Calculus II", "prerequisites": ["Calculus I", "Algebra"]}],
+        [{"name": "Calculus I", "prerequisites": []}]
+    )
+    issues = validate_roadmap(rm)
+    assert any("requires Algebra" in i for i in issues)
+    assert any("requires Calculus I, which is in semester 2" in i for i in issues)
+
+
+def test_cycle_is_reported():
+    rm = roadmap([
+        {"name": "A", "prerequisites": ["B"]},
+        {"name": "B", "prerequisites": ["A"]}
+    ])
+    assert any(i.startswith("Prerequisite cycle") for i in validate_roadmap(rm))
+
+
+def test_null_prerequisites_are_skipped():
+    rm = roadmap([
+        {"name": "Physics", "prerequisites": [None, "", {"name": None}]},
+        {"name": "Chemistry", "prerequisites": None}
+    ])
+    assert validate_roadmap(rm) == []
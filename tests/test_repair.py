@@ -0,0 +1,41 @@
+import pytest
+
+from json_stream import repair_json
+
+
+def test_complete_object_is_returned_as_is():
+    assert repair_json('{"predicted_level": "Advanced", "reason": "ok"}') == {
+        "predicted_level": "Advanced", "reason": "ok"
+    }
+
+
+def test_surrounding_text_is_ignored():
+    assert repair_json('Here you go: {"a": 1} hope that helps') == {"a": 1}
+
+
+def test_cut_inside_string_keeps_the_prefix():
+    assert repair_json('{"predicted_level": "Inter') == {"predicted_level": "Inter"}
+
+
+def test_cut_after_escape():
+    assert repair_json('{"a": {"b": "x\\') == {"a": {"b": "x"}}
+
+
+def test_unfinished_number_is_dropped():
+    # "2" may be the start of "25", so only closed values are kept
+    assert repair_json('{"a": 1, "b": [1, 2') == {"a": 1, "b": [1]}
+
+
+def test_unfinished_array_item_is_closed():
+    assert repair_json('{"operations": [{"op": "add"}, {"op": "mo') == {
+        "operations": [{"op": "add"}, {"op": "mo"}]
+    }
+
+
+def test_dangling_key_is_dropped():
+    assert repair_json('{"a": "{[", "b":') == {"a": "{["}
+
+
+def test_no_object_raises():
+    with pytest.raises(ValueError):
+        repair_json("no json here")
@@ -0,0 +1,48 @@
+from balancer import balance_roadmap
+from roadmap_model import RoadmapModel
+
+
+def roadmap():
+    return {
+        "semesters": [
+            {
+                "semester_number": 1,
+                "mandatory": [{"name": "A", "credits": 4}, {"name": "B", "credits": "4"}],
+                "recommended": [{"name": "C", "credits": 4}],
+                "optional": []
+            },
+            {"semester_number": 2, "mandatory": [], "recommended": [], "optional": []}
+        ]
+    }
+
+
+def test_totals_and_lightest():
+    model = RoadmapModel(roadmap())
+    assert model.credits(1) == 12
+    assert model.category_credits(1, "mandatory") == 8
+    assert model.lightest() == 2
+
+
+def test_place_and_move_keep_totals():
+    model = RoadmapModel(roadmap())
+
+    assert model.place("optional", {"name": "D", "credits": 3}, 24) == 2
+    assert model.credits(2) == 3
+
+    model.move("A", "mandatory", 1, 2)
+    assert (model.credits(1), model.credits(2)) == (8, 7)
+    assert model.lightest() == 2
+
+    assert model.place("optional", {"name": "E", "credits": 30}, 24) is None
+
+
+def test_balancer_moves_replay_through_model():
+    model = RoadmapModel(roadmap())
+    _, moves = balance_roadmap(model.roadmap, 24, fields=model.categories)
+
+    for course, source, target in moves:
+        assert any(model.move(course, cat, source, target) for cat in model.categories)
+
+    assert sorted(model.totals.values()) == [4, 8]
+    rebuilt = RoadmapModel(model.roadmap)
+    assert rebuilt.totals == model.totals
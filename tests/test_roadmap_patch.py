@@ -0,0 +1,94 @@
+from conftest import roadmap
+from roadmap_patch import apply_patch, compact_view
+
+
+def course(name, credits=4):
+    return {"name": name, "credits": credits, "difficulty": "Medium", "prerequisites": []}
+
+
+def plan():
+    return roadmap(
+        [course("Calculus I"), course("Programming"), course("Physics")],
+        [course("Calculus II")]
+    )
+
+
+def names(rm, number):
+    return [c["name"] for c in rm["semesters"][number - 1]["courses"]]
+
+
+def test_compact_view_lists_ids():
+    assert "1.1 Programming [4cr, Medium]" in compact_view(plan())
+
+
+def test_add_move_remove():
+    rm = plan()
+    updated, errors = apply_patch(rm, [
+        {"op": "add", "semester": 2, "course": {"name": "Statistics", "credits": 3}},
+        {"op": "move", "id": "1.2", "semester": 2},
+        {"op": "remove", "course": "Calculus II"}
+    ])
+
+    assert errors == []
+    assert names(updated, 1) == ["Calculus I", "Programming"]
+    assert names(updated, 2) == ["Statistics", "Physics"]
+    assert updated["semesters"][1]["total_credits"] == 7
+    # the input roadmap is left alone
+    assert names(rm, 1) == ["Calculus I", "Programming", "Physics"]
+
+
+def test_ids_refer_to_the_roadmap_the_model_saw():
+    # removing 1.0 must not shift 1.2 onto another course
+    updated, errors = apply_patch(plan(), [
+        {"op": "remove", "id": "1.0"},
+        {"op": "move", "id": "1.2", "semester": 2}
+    ])
+
+    assert errors == []
+    assert names(updated, 1) == ["Programming"]
+    assert names(updated, 2) == ["Calculus II", "Physics"]
+
+
+def test_removed_course_cannot_be_used_again():
+    _, errors = apply_patch(plan(), [
+        {"op": "remove", "id": "1.1"},
+        {"op": "move", "id": "1.1", "semester": 2}
+    ])
+    assert errors == ["move: course 1.1 not found"]
+
+
+def test_duplicate_name_is_rejected():
+    updated, errors = apply_patch(plan(), [
+        {"op": "add", "semester": 2, "course": {"name": "  physics "}}
+    ])
+    assert errors == ["add physics: course already exists"]
+    assert names(updated, 2) == ["Calculus II"]
+
+
+def test_non_object_course_is_rejected():
+    updated, errors = apply_patch(plan(), [
+        {"op": "add", "semester": 2, "course": "Statistics"},
+        {"op": "add", "semester": 2, "course": ["Statistics"]}
+    ])
+    assert len(errors) == 2
+    assert all(e.startswith("add: course must be an object") for e in errors)
+    assert names(updated, 2) == ["Calculus II"]
+
+
+def test_string_credits_are_counted():
+    rm = roadmap([course("Calculus I", "4"), course("Programming", "3 credits")], [])
+    updated, errors = apply_patch(rm, [
+        {"op": "add", "semester": "1", "course": {"name": "Statistics", "credits": "2.0"}}
+    ])
+    assert errors == []
+    assert updated["semesters"][0]["total_credits"] == 6
+
+
+def test_bad_operations_are_reported():
+    _, errors = apply_patch(plan(), [
+        {"op": "rename"},
+        "remove everything",
+        {"op": "move", "id": "1.0", "semester": 9},
+        {"op": "add", "semester": 9, "course": {"name": "Art"}}
+    ])
+    assert len(errors) == 4
@@ -0,0 +1,74 @@
+import pytest
+
+import router
+from conftest import FakeClient
+from router import MIN_SAMPLES, ModelRouter, post_with_fallback, stream_with_fallback
+from telemetry import MetricsRegistry, make_event
+
+ROUTES = {
+    "default": {"model": "big", "fallback": "small"},
+    "chat": {"model": "big", "fallback": "small", "budget_ms": 1000},
+    "warm": {"model": "mid", "fallback": "small"}
+}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(router, "_router", ModelRouter(ROUTES, registry))
+    return registry
+
+
+def observe(registry, n, model="big", **result):
+    first_token = result.pop("first_token", None)
+    for _ in range(n):
+        registry.observe(make_event("chat", model, result.pop("wall", 2.0), result=result, first_token=first_token))
+
+
+def test_post_reports_the_model_that_answered(registry):
+    client = FakeClient()
+    assert post_with_fallback(client, {"model": "big"}, "chat")[1] == "big"
+
+    client = FakeClient(fail={"big"})
+    response, model = post_with_fallback(client, {"model": "big"}, "chat")
+    assert model == "small"
+    assert client.models == ["big", "small"]
+
+
+def test_stream_reports_the_model_that_answered(registry):
+    client = FakeClient(stream=[{"response": "hi", "done": True}], fail={"big"})
+    chunks = list(stream_with_fallback(client, {"model": "big"}, "chat"))
+    assert chunks == [("small", {"response": "hi", "done": True})]
+
+
+def test_p95_leaves_out_load_time(registry):
+    observe(registry, MIN_SAMPLES, wall=2.0, load_duration=1.5e9)
+    assert registry.model_p95("chat", "big", 60) == pytest.approx(500)
+    assert router.get_router().route("chat")[0] == "big"
+
+
+def test_p95_uses_first_token_for_streamed_calls(registry):
+    registry.observe(make_event("chat", "big", 5.0, first_token=0.3))
+    assert registry.model_p95("chat", "big", 60) == pytest.approx(300)
+
+
+def test_route_falls_back_only_after_enough_slow_samples(registry):
+    observe(registry, MIN_SAMPLES - 1)
+    assert router.get_router().route("chat")[0] == "big"
+
+    observe(registry, 1)
+    assert router.get_router().route("chat")[0] == "small"
+
+
+def test_old_samples_age_out(registry):
+    for _ in range(MIN_SAMPLES):
+        event = make_event("chat", "big", 2.0)
+        event["ts"] -= router.BUDGET_WINDOW + 1
+        registry.observe(event)
+
+    assert registry.model_p95("chat", "big", router.BUDGET_WINDOW) is None
+    assert router.get_router().route("chat")[0] == "big"
+
+
+def test_models_include_fallbacks(registry):
+    assert router.get_router().models() == ["big", "mid", "small"]
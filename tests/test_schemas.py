@@ -0,0 +1,59 @@
+import pytest
+
+from schemas import SchemaError, response_format, validate
+
+
+def course(**fields):
+    return dict({"name": "Algebra", "difficulty": "Easy", "credits": 4}, **fields)
+
+
+def semester(*courses, **fields):
+    return dict({"semester_number": 1, "courses": list(courses)}, **fields)
+
+
+@pytest.mark.parametrize("credits, expected", [("4 credits", 4), ("4", 4), (3.6, 4), (4, 4)])
+def test_credits_are_coerced_to_integers(credits, expected):
+    assert validate("semester", semester(course(credits=credits)))["courses"][0]["credits"] == expected
+
+
+@pytest.mark.parametrize("difficulty", ["medium", "MEDIUM", " Medium "])
+def test_enum_is_case_folded(difficulty):
+    assert validate("semester", semester(course(difficulty=difficulty)))["courses"][0]["difficulty"] == "Medium"
+
+
+def test_comma_separated_prerequisites_become_a_list():
+    data = semester(course(prerequisites="Calculus 1, Linear Algebra,"))
+    assert validate("semester", data)["courses"][0]["prerequisites"] == ["Calculus 1", "Linear Algebra"]
+
+
+def test_missing_semester_fields_are_filled_in():
+    sem = validate("semester", semester(course(credits=4), course(credits="3 credits")))
+    assert sem["summary"] == ""
+    assert sem["total_credits"] == 7
+    assert sem["courses"][0]["prerequisites"] == []
+
+
+def test_given_total_credits_is_kept():
+    assert validate("semester", semester(course(), total_credits="20"))["total_credits"] == 20
+
+
+def test_roadmap_semesters_are_filled_in():
+    data = validate("roadmap", {"semesters": [semester(course())]})
+    assert data["semesters"][0]["summary"] == ""
+    assert data["semesters"][0]["total_credits"] == 4
+
+
+def test_every_problem_is_reported():
+    with pytest.raises(SchemaError) as e:
+        validate("semester", semester(course(difficulty="Brutal", credits="lots"), {"name": "X"}))
+
+    assert "semester.courses[0].difficulty: expected one of Easy, Medium, Hard" in e.value.errors
+    assert "semester.courses[0].credits: expected integer" in e.value.errors
+    assert "semester.courses[1].difficulty: missing" in e.value.errors
+    assert isinstance(e.value, ValueError)
+
+
+def test_unknown_call_types_pass_through():
+    data = {"anything": 1}
+    assert validate("default", data) is data
+    assert response_format("default") == "json"
@@ -0,0 +1,103 @@
+import pytest
+
+import semantic_cache
+from semantic_cache import SemanticIndex, cached_result, describe, find_result, publish_result
+from shared_cache import ROADMAP_FIELDS, SharedCache
+
+
+def program(domain="Data Science", focus="Machine Learning", degree="B.Tech", **extra):
+    return dict(degree=degree, domain=domain, focus=focus, level="Beginner", duration=4, **extra)
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    shared = SharedCache()
+    index = SemanticIndex()
+    monkeypatch.setattr(semantic_cache, "get_shared_cache", lambda: shared)
+    monkeypatch.setattr(semantic_cache, "get_semantic_index", lambda: index)
+    return shared, index
+
+
+def test_near_identical_program_hits(caches):
+    publish_result("roadmap", program(), {"semesters": [1]}, ROADMAP_FIELDS)
+    assert find_result("roadmap", program(domain="Data-Science"), ROADMAP_FIELDS) == {"semesters": [1]}
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("Data Science", "Data Sciences"),
+    ("Behavioural Science", "Behavioral Sciences")
+])
+def test_spelling_variant_hits_through_the_index(caches, cached, query):
+    shared, index = caches
+    publish_result("roadmap", program(domain=cached), {"semesters": [1]}, ROADMAP_FIELDS)
+    assert find_result("roadmap", program(domain=query), ROADMAP_FIELDS) == {"semesters": [1]}
+    assert index.stats()["hits"] == 1
+
+
+def test_degree_must_match_exactly(caches):
+    publish_result("roadmap", program(), {"semesters": [1]}, ROADMAP_FIELDS)
+    assert find_result("roadmap", program(degree="BSc"), ROADMAP_FIELDS) is None
+
+
+@pytest.mark.parametrize("focus", ["Machine Learning Ops", "Machine Learning Systems", "Deep Learning"])
+def test_focus_must_match_exactly(caches, focus):
+    publish_result("roadmap", program(), {"semesters": [1]}, ROADMAP_FIELDS)
+    assert find_result("roadmap", program(focus=focus), ROADMAP_FIELDS) is None
+
+
+def test_every_field_must_clear_the_threshold():
+    index = SemanticIndex()
+    index.add("g", ("computer science", "data science"), "k")
+    # one identical field cannot carry a dissimilar one
+    assert index.search(["g"], [("computer science", "civil engineering")]) == [None]
+    assert index.search(["g"], [("computer science", "data science")])[0][0] == "k"
+
+
+@pytest.mark.parametrize("cached, query", [
+    ("Organic Chemistry I", "Organic Chemistry II"),
+    ("Introduction to Programming", "Introduction to Programming Lab"),
+    ("Calculus 1", "Calculus 2")
+])
+def test_course_levels_and_tags_must_match(caches, cached, query):
+    publish_result("sessions", cached, {"sessions": []})
+    assert find_result("sessions", query) is None
+
+
+def test_course_name_variants_hit(caches):
+    publish_result("sessions", "Introduction to Machine Learning", {"sessions": [1]})
+    assert find_result("sessions", "Intro to ML") == {"sessions": [1]}
+    assert find_result("sessions", "Organic Chemistry II") is None
+
+
+def test_expired_rows_are_dropped_before_choosing(caches, monkeypatch):
+    shared, index = caches
+    publish_result("sessions", "Introduction to Machine Learning", {"sessions": ["old"]})
+    publish_result("sessions", "Introduction Machine Learning", {"sessions": ["new"]})
+
+    old_key = semantic_cache.exact_key("sessions", "Introduction to Machine Learning")
+    stamp, value = shared._entries[old_key]
+    shared._entries[old_key] = (stamp - shared.ttl - 1, value)
+
+    assert find_result("sessions", "Intro to Machine Learning") == {"sessions": ["new"]}
+    assert index.stats()["entries"] == 1
+
+
+def test_cached_result_computes_once(caches):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"level": "Beginner"}
+
+    fields = ROADMAP_FIELDS + ["weekly"]
+    assert cached_result("capability", program(weekly=10), compute, fields) == {"level": "Beginner"}
+    assert cached_result("capability", program(domain="Data-Science", weekly=10), compute, fields) == {"level": "Beginner"}
+    assert cached_result("capability", program(weekly=20), compute, fields) == {"level": "Beginner"}
+    assert len(calls) == 2
+
+
+def test_describe_groups_on_exact_fields():
+    group, texts = describe("roadmap", program(), ROADMAP_FIELDS)
+    assert texts == ("data science",)
+    assert '"degree": "b.tech"' in group
+    assert '"focus": "machine learning"' in group
@@ -0,0 +1,71 @@
+import pytest
+
+from timetable import DAYS, allocate_slots, generate_timetable, split_sessions
+
+
+def courses(count, credits=4, difficulty="Medium"):
+    return [
+        {"name": f"Course {i}", "credits": credits, "difficulty": difficulty}
+        for i in range(count)
+    ]
+
+
+def hours_by_course(table):
+    totals = {}
+    for entries in table.values():
+        for e in entries:
+            totals[e["course"]] = totals.get(e["course"], 0) + e["hours"]
+    return totals
+
+
+def test_allocate_slots_sums_exactly():
+    assert sum(allocate_slots([1, 1, 1], 10)) == 10
+    assert allocate_slots([3, 1], 8) == [6, 2]
+    assert allocate_slots([], 8) == []
+    assert allocate_slots([1, 2], 0) == [0, 0]
+
+
+def test_split_sessions_limits():
+    assert split_sessions(0, 6) == []
+    assert split_sessions(1, 6) == [1]
+    assert split_sessions(4, 6) == [2, 2]
+    assert all(1 <= s <= 4 for s in split_sessions(11, 6))
+    assert sum(split_sessions(11, 6)) == 11
+
+
+@pytest.mark.parametrize("weekly", [6, 20, 27.5, 40])
+def test_weekly_hours_are_fully_scheduled(weekly):
+    table = generate_timetable(courses(5), weekly)
+    assert sum(hours_by_course(table).values()) == pytest.approx(weekly)
+
+
+def test_daily_cap_is_respected():
+    table = generate_timetable(courses(6), 24, max_daily_hours=5)
+    for entries in table.values():
+        assert sum(e["hours"] for e in entries) <= 5
+
+
+def test_heavier_courses_get_more_hours():
+    table = generate_timetable(
+        [
+            {"name": "Hard", "credits": 4, "difficulty": "Hard"},
+            {"name": "Easy", "credits": 4, "difficulty": "Easy"}
+        ],
+        20
+    )
+    totals = hours_by_course(table)
+    assert totals["Hard"] > totals["Easy"]
+
+
+def test_deterministic():
+    assert generate_timetable(courses(7), 21) == generate_timetable(courses(7), 21)
+
+
+def test_bad_credits_fall_back_to_default():
+    table = generate_timetable([{"name": "A", "credits": "four"}, {"name": "B"}], 10)
+    totals = hours_by_course(table)
+    assert totals["A"] == totals["B"]
+
+
+def test_empty_input():
+    assert generate_timetable([], 20) == {d: [] for d in DAYS}
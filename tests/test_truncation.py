@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+import curriculum
+from conftest import FakeClient, Reply
+
+
+@pytest.fixture
+def puts(monkeypatch):
+    stored = []
+    monkeypatch.setattr(curriculum, "cache_get", lambda *a, **k: None)
+    monkeypatch.setattr(curriculum, "cache_put", lambda *a, **k: stored.append(a))
+    return stored
+
+
+def sessions(*numbers):
+    return [{"session_number": n, "topic": f"Topic {n}"} for n in numbers]
+
+
+def cut(items, key="sessions"):
+    # a reply that stops halfway through the item after the given ones
+    text = json.dumps({key: items})[:-2]
+    return text + ', {"session_number": 9, "top'
+
+
+def semester(n):
+    return {"semester_number": n, "courses": [{"name": f"Course {n}", "difficulty": "Easy", "credits": 4}]}
+
+
+def test_truncated_reply_is_continued_and_cached(puts):
+    client = FakeClient([
+        Reply(cut(sessions(1, 2)), "length"),
+        Reply(json.dumps({"sessions": sessions(3)}))
+    ])
+    data = curriculum.fetch_ai(client, "p", call_type="sessions")
+
+    assert [s["session_number"] for s in data["sessions"]] == [1, 2, 3]
+    assert len(puts) == 1
+
+
+def test_invalid_reply_that_was_not_cut_off_is_an_error(puts):
+    client = FakeClient([Reply(cut(sessions(1, 2)), "stop")])
+
+    with pytest.raises(curriculum.AIJSONError):
+        curriculum.fetch_ai(client, "p", call_type="sessions")
+    assert len(client.prompts) == 1
+    assert puts == []
+
+
+def test_short_continuation_is_not_cached(puts):
+    client = FakeClient([
+        Reply(cut(sessions(1, 2)), "length"),
+        Reply(cut(sessions(3)), "length"),
+        Reply(cut(sessions(4)), "length")
+    ])
+
+    with pytest.raises(curriculum.AIJSONError):
+        curriculum.fetch_ai(client, "p", call_type="sessions")
+    assert puts == []
+
+
+def test_expected_count_caps_and_gates_the_cache(puts):
+    roadmap = {"semesters": [semester(n) for n in (1, 2, 3, 4, 5)]}
+
+    data = curriculum.fetch_ai(FakeClient([Reply(json.dumps(roadmap))]), "p", call_type="roadmap", expected=4)
+    assert len(data["semesters"]) == 4
+    assert len(puts) == 1
+
+    short = {"semesters": [semester(1)]}
+    data = curriculum.fetch_ai(FakeClient([Reply(json.dumps(short))]), "p", call_type="roadmap", expected=4)
+    assert len(data["semesters"]) == 1
+    assert len(puts) == 1
+
+
+def test_continuation_stops_at_expected():
+    client = FakeClient([Reply(json.dumps({"semesters": [semester(n) for n in (3, 4, 5, 6)]}))])
+    items, complete = curriculum.fetch_continuation(
+        client, "p", "roadmap", [semester(1), semester(2)], expected=4
+    )
+    assert complete
+    assert [s["semester_number"] for s in items] == [1, 2, 3, 4]
+
+
+def stream_chunks(text, done_reason):
+    chunks = [{"response": text[i:i + 7], "done": False} for i in range(0, len(text), 7)]
+    return chunks + [{"response": "", "done": True, "done_reason": done_reason}]
+
+
+DATA = {"degree": "B.Tech", "domain": "CS", "focus": "AI", "level": "Beginner", "duration": 2}
+
+
+def test_stream_roadmap_continues_after_length_cut(puts):
+    text = json.dumps({"semesters": [semester(1), semester(2)]})[:-30]
+    client = FakeClient(
+        [Reply(json.dumps({"semesters": [semester(n) for n in (2, 3, 4)]}))],
+        stream_chunks(text, "length")
+    )
+
+    result = list(curriculum.stream_roadmap(client, DATA))
+
+    assert [s["semester_number"] for s in result] == [1, 2, 3, 4]
+    assert len(puts) == 1
+
+
+def test_stream_roadmap_that_stopped_short_is_not_cached(puts):
+    text = json.dumps({"semesters": [semester(1), semester(2)]})
+    client = FakeClient([], stream_chunks(text, "stop"))
+
+    result = list(curriculum.stream_roadmap(client, DATA))
+
+    assert len(result) == 2
+    # only the stream itself, no continuation request
+    assert len(client.prompts) == 1
+    assert puts == []
+
+
+def test_stream_roadmap_drops_extra_semesters(puts):
+    text = json.dumps({"semesters": [semester(n) for n in range(1, 7)]})
+    result = list(curriculum.stream_roadmap(FakeClient([], stream_chunks(text, "stop")), DATA))
+
+    assert len(result) == 4
+    assert len(json.loads(puts[0][2])["semesters"]) == 4
@@ -0,0 +1,146 @@
+import math
+from functools import lru_cache
+
+# =====================================================
+# WEEKLY TIMETABLE SCHEDULER
+# =====================================================
+#
+# Deterministic replacement for the old random.sample(days, 2) timetable.
+# Weekly hours are shared out by credits x difficulty in half-hour slots
+# (largest remainder, so they add up exactly), each course is cut into
+# sessions of at most two hours, and sessions go to the least-loaded day
+# that does not already hold that course, never past the daily cap.
+# Same semester in, same table out; results are memoised.
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+SLOT_HOURS = 0.5
+MIN_SESSION_HOURS = 1.0
+MAX_SESSION_HOURS = 2.0
+DEFAULT_CREDITS = 3
+
+DIFFICULTY_WEIGHT = {
+    "easy": 1.0,
+    "medium": 1.25,
+    "hard": 1.5
+}
+
+
+def course_weight(course):
+
+    credits = course.get("credits")
+    if not isinstance(credits, (int, float)) or credits <= 0:
+        credits = DEFAULT_CREDITS
+
+    difficulty = str(course.get("difficulty", "")).strip().lower()
+    return credits * DIFFICULTY_WEIGHT.get(difficulty, DIFFICULTY_WEIGHT["medium"])
+
+
+def allocate_slots(weights, total):
+
+    # largest remainder: integer slots proportional to weight, summing to total
+    weight_sum = sum(weights)
+    if not weights or weight_sum <= 0 or total <= 0:
+        return [0] * len(weights)
+
+    shares = [w * total / weight_sum for w in weights]
+    slots = [int(s) for s in shares]
+    order = sorted(range(len(weights)), key=lambda i: (slots[i] - shares[i], i))
+
+    for i in order[:total - sum(slots)]:
+        slots[i] += 1
+
+    return slots
+
+
+def split_sessions(slots, day_count):
+
+    if slots <= 0:
+        return []
+
+    min_slots = int(MIN_SESSION_HOURS / SLOT_HOURS)
+    max_slots = int(MAX_SESSION_HOURS / SLOT_HOURS)
+
+    # at least two meetings a week when there are hours for them
+    count = max(math.ceil(slots / max_slots), min(2, slots // min_slots), 1)
+    count = min(count, day_count, slots)
+
+    size, extra = divmod(slots, count)
+    return [size + 1 if i < extra else size for i in range(count)]
+
+
+@lru_cache(maxsize=1024)
+def _schedule(courses, total_slots, days, cap):
+
+    day_count = len(days)
+    load = [0] * day_count
+    placed = [{} for _ in days]
+
+    allocation = allocate_slots([w for _, w in courses], total_slots)
+
+    # biggest courses first, so the small ones fill the gaps
+    order = sorted(range(len(courses)), key=lambda i: (-allocation[i], i))
+
+    for i in order:
+        name = courses[i][0]
+        used = set()
+
+        for session in split_sessions(allocation[i], day_count):
+
+            def preference(d):
+                gap = min((abs(d - u) for u in used), default=day_count)
+                return (d in used, load[d], -gap, (d - i) % day_count)
+
+            fits = [d for d in range(day_count) if load[d] + session <= cap]
+
+            if fits:
+                targets = [(min(fits, key=preference), session)]
+            else:
+                # no single day has room left; spread the session over the
+                # remaining capacity
+                targets = []
+                remaining = session
+                for d in sorted(range(day_count), key=preference):
+                    if remaining == 0:
+                        break
+                    take = min(cap - load[d], remaining)
+                    if take > 0:
+                        targets.append((d, take))
+                        remaining -= take
+
+            for d, take in targets:
+                load[d] += take
+                placed[d][name] = placed[d].get(name, 0) + take
+                used.add(d)
+
+    return tuple(
+        tuple((name, slots * SLOT_HOURS) for name, slots in placed[d].items())
+        for d in range(day_count)
+    )
+
+
+def generate_timetable(courses, weekly_hours, days=DAYS, max_daily_hours=None):
+
+    days = tuple(days)
+    table = {d: [] for d in days}
+
+    if not courses or not days:
+        return table
+
+    total_slots = int(round(weekly_hours / SLOT_HOURS))
+
+    # default cap is an even spread plus one slot of slack; it can never be
+    # below an even spread, or the hours would not fit
+    cap = math.ceil(total_slots / len(days))
+    if max_daily_hours is None:
+        cap += 1
+    else:
+        cap = max(cap, int(max_daily_hours / SLOT_HOURS))
+
+    key = tuple(
+        (str(c.get("name", "")), course_weight(c)) for c in courses
+    )
+
+    for day, entries in zip(days, _schedule(key, total_slots, days, cap)):
+        table[day] = [{"course": name, "hours": hours} for name, hours in entries]
+
+    return table
@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+
+from ollama_client import OllamaError
+
+# =====================================================
+# CONFIG
+# =====================================================
+#
+# Loads the routed models (fallbacks included) in the background when the
+# app starts, so the first real call does not pay Ollama's load_duration,
+# and keeps them resident while people are using the app: every
+# PING_INTERVAL an empty prompt (load only, no generation) renews
+# keep_alive. After IDLE_RELEASE seconds without a rerun the models are
+# unloaded (keep_alive 0); the next rerun loads them again in the background.
+
+WARMUP_ENABLED = os.environ.get("MODEL_WARMUP", "1") != "0"
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "10m")
+IDLE_RELEASE = float(os.environ.get("MODEL_IDLE_RELEASE", 30 * 60))
+PING_INTERVAL = 4 * 60
+
+
+class ModelKeeper:
+
+    def __init__(
+        self,
+        client,
+        models,
+        keep_alive=KEEP_ALIVE,
+        idle_release=IDLE_RELEASE,
+        ping_interval=PING_INTERVAL
+    ):
+        self.client = client
+        self.models = list(dict.fromkeys(models))
+        self.keep_alive = keep_alive
+        self.idle_release = idle_release
+        self.ping_interval = ping_interval
+        self.last_active = time.time()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._resident = {}
+        self._load_ms = {}
+        self._released = False
+
+    def _ping(self, model, keep_alive):
+
+        # an empty prompt only loads the model (or unloads it with
+        # keep_alive 0); nothing is generated
+        response = self.client.post(
+            {"model": model, "prompt": "", "stream": False, "keep_alive": keep_alive},
+            "warmup"
+        )
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    def warm(self):
+        for model in self.models:
+            try:
+                result = self._ping(model, self.keep_alive)
+            except OllamaError:
+                continue
+
+            if result is not None:
+                with self._lock:
+                    self._resident[model] = time.time()
+                    self._load_ms[model] = round(result.get("load_duration", 0) / 1e6, 2)
+
+    def release(self):
+        with self._lock:
+            models = list(self._resident)
+            self._resident.clear()
+            self._released = True
+
+        for model in models:
+            try:
+                self._ping(model, 0)
+            except OllamaError:
+                pass
+
+    def touch(self):
+
+        # called on every rerun; reloads in the background after a release
+        self.last_active = time.time()
+
+        with self._lock:
+            released = self._released
+            self._released = False
+
+        if released:
+            threading.Thread(target=self.warm, daemon=True).start()
+
+    def _run(self):
+        self.warm()
+
+        while not self._stop.wait(self.ping_interval):
+            if time.time() - self.last_active > self.idle_release:
+                if self._resident:
+                    self.release()
+            elif not self._released:
+                self.warm()
+
+    def start(self):
+        if WARMUP_ENABLED and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="model-keeper")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        now = time.time()
+        with self._lock:
+            return [
+                dict(
+                    model=model,
+                    resident=model in self._resident,
+                    last_ping_s=round(now - self._resident[model]) if model in self._resident else None,
+                    load_ms=self._load_ms.get(model)
+                )
+                for model in self.models
+            ]